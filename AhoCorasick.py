@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Aho-Corasick """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import re
+from collections import deque
+
+
+PREFIX_LENGTH = 3
+# length of the pattern prefixes that are searched to skip text
+
+class Automaton:
+
+    def __init__(self, patterns):
+        # State 0 is the root. transitions[state] maps a character to the
+        # next state; the failure links are already folded in, so a missing
+        # character always leads back to the root. depth is the length of
+        # the prefix a state stands for, longest the length of the longest
+        # pattern that ends in the state (0 if none).
+        patterns = set(patterns)
+        if "" in patterns:
+            raise ValueError("the empty string cannot be searched")
+        goto = [{}]
+        terminal = [False]
+        self.depth = [0]
+        for pattern in patterns:
+            state = 0
+            for character in pattern:
+                if character not in goto[state]:
+                    goto.append({})
+                    terminal.append(False)
+                    self.depth.append(self.depth[state] + 1)
+                    goto[state][character] = len(goto) - 1
+                state = goto[state][character]
+            terminal[state] = True
+
+        self.transitions = [dict(goto[0])]
+        self.transitions.extend({} for _ in range(len(goto) - 1))
+        self.longest = [0] * len(goto)
+        failure = [0] * len(goto)
+        queue = deque(goto[0].values())  # breadth first, parents come first
+        while queue:
+            state = queue.popleft()
+            fallback = failure[state]
+            transitions = dict(self.transitions[fallback])
+            transitions.update(goto[state])
+            self.transitions[state] = transitions
+            self.longest[state] = (self.depth[state] if terminal[state]
+                                   else self.longest[fallback])
+            for character, child in goto[state].items():
+                failure[child] = self.transitions[fallback].get(character, 0)
+                queue.append(child)
+        prefixes = sorted({pattern[:PREFIX_LENGTH] for pattern in patterns})
+        self.match_start = re.compile(
+            "|".join(map(re.escape, prefixes))) if prefixes else None
+        # finds the next position where a match can start. No pattern is
+        # matched here, the prefixes only rule out most of the positions
+
+    def matches(self, text):
+        """
+        Finds the leftmost-longest matches that do not overlap, in one pass
+        over the text. Where no pattern can start, the text is skipped with
+        a regular expression instead of stepping the automaton.
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        matches : generator
+            (start, end) of every match
+
+        """
+        if self.match_start is None:  # no patterns
+            return
+        transitions, depth, longest = (self.transitions, self.depth,
+                                       self.longest)
+        skip = self.match_start.search
+        length = len(text)
+        position = 0
+        while True:
+            found = skip(text, position)
+            if found is None:
+                return
+            start = found.start()
+            state = 0
+            match_start = match_end = -1
+            # the best match so far; it is final as soon as the automaton
+            # no longer covers its start
+            for position in range(start, length):
+                state = transitions[state].get(text[position], 0)
+                end = position + 1
+                if longest[state] and (match_start < 0 or end -
+                                       longest[state] <= match_start):
+                    match_start, match_end = end - longest[state], end
+                if match_start >= 0 and end - depth[state] > match_start:
+                    break
+                if state == 0:
+                    break
+            if match_start >= 0:
+                yield match_start, match_end
+                position = match_end
+            else:  # no pattern goes on after the last character read
+                position += 1
+            if position >= length:
+                return
+
+
+def substitute(text, mapping, automaton=None):
+    """
+    Replaces every search string of mapping in text by its replacement.
+    Matches are found from left to right; where two search strings start at
+    the same position the longer one wins. Replaced text is not searched
+    again.
+
+    Parameters
+    ----------
+    text : str
+    mapping : dict
+        key: search string, value: replacement
+    automaton : Automaton
+        automaton for the keys of mapping, built if not given
+
+    Returns
+    -------
+    (new_text, count) : tuple
+        count is the number of replacements
+
+    """
+    if automaton is None:
+        automaton = Automaton(mapping)
+    parts = []
+    count = 0
+    previous_end = 0
+    for start, end in automaton.matches(text):
+        parts.append(text[previous_end:start])
+        parts.append(mapping[text[start:end]])
+        previous_end = end
+        count += 1
+    if not count:
+        return text, 0
+    parts.append(text[previous_end:])
+    return "".join(parts), count
+
+
+if __name__ == "__main__":
+    print("\nTest: substitute")
+    print(substitute("Hund und Katze", {"Hund": "Katze", "Katze": "Hund"}))
+    # expected output: ('Katze und Hund', 2)
+    print(substitute("ushers", {"he": "1", "she": "2", "hers": "3"}))
+    # expected output: ('u2rs', 1)
+    print(substitute("abcd", {"bcd": "X", "abce": "Y", "a": "Z"}))
+    # expected output: ('ZX', 2)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Background Worker """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import threading
+from contextlib import contextmanager
+
+
+class BackgroundWorker:
+
+    def __init__(self, step_size=256):
+        # Computes the formatted text and the word index of an editor in a
+        # thread while the user types the next command, so that PRINT and
+        # INDEX find them ready (see Editor.precompute). The work is done in
+        # small steps while holding the lock of condition; a command runs
+        # while holding it too (see paused), so the editor is only used by
+        # one thread at a time. After every step the worker stops if the
+        # text was changed (see Editor.version) or a newer job was
+        # scheduled. Results are only set in the editor when they are
+        # complete, so a command never sees a partial or outdated result.
+        self.step_size = step_size  # paragraphs per step
+        self.condition = threading.Condition()
+        self.pausing = 0  # number of commands that wait for the lock
+        self.job = None  # (editor, version, index) that waits to be started
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    @contextmanager
+    def paused(self):
+        """
+        Stops the worker after its current step for the with block, e.g. to
+        run a command.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        context manager
+
+        """
+        self.pausing += 1
+        with self.condition:
+            self.pausing -= 1
+            try:
+                yield
+            finally:
+                self.condition.notify_all()
+
+    def schedule(self, editor, index=False):
+        """
+        Starts to compute the formatted text (and the word index) of an
+        editor. The job that is running is cancelled after its current step.
+
+        Parameters
+        ----------
+        editor : Editor
+        index : bool
+            also compute the word index
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.condition:
+            self.job = (editor, editor.version, index)
+            self.condition.notify_all()
+
+    def close(self):
+        """
+        Cancels the running job and stops the thread.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def run(self):
+        # the thread, runs one job after the other until close()
+        with self.condition:
+            while True:
+                self.condition.wait_for(
+                    lambda: self.closed or (self.job is not None
+                                            and not self.pausing))
+                if self.closed:
+                    return
+                editor, version, index = self.job
+                self.job = None
+                try:
+                    for _ in editor.precompute(index, self.step_size):
+                        if self.pausing:  # a command waits for the lock
+                            self.condition.wait_for(
+                                lambda: not self.pausing or self.closed)
+                        if (self.closed or self.job is not None
+                                or editor.version != version):
+                            break  # the results would be outdated
+                except Exception:
+                    # e.g. the document was closed meanwhile. Nothing was set
+                    # in the editor, the next command computes it itself
+                    pass
+
+
+if __name__ == "__main__":
+    import time
+
+    from Editor import Editor
+
+    def wait_for_index(worker, editor):
+        # polls like a user who types the next command
+        while True:
+            with worker.paused():
+                if editor.word_index is not None:
+                    return
+            time.sleep(0.01)
+
+    print("\nTest: BackgroundWorker")
+    editor = Editor()
+    editor.add_many(["Hund und Katze"] * 1000, 1)
+    editor.change_format("fix", 8)
+    worker = BackgroundWorker(step_size=16)
+    worker.schedule(editor, index=True)
+    wait_for_index(worker, editor)
+    print(editor.text_in_format_is_valid, len(editor.word_index))
+    # expected output: True 2
+
+    print("\nTest: an edit cancels the job")
+    with worker.paused():
+        editor.add_n("Maus", 1)
+        worker.schedule(editor, index=True)
+    with worker.paused():
+        editor.add_n("Igel", 1)  # the job for 'Maus' is outdated now
+        worker.schedule(editor, index=True)
+    wait_for_index(worker, editor)
+    worker.close()
+    print(editor.text_in_format_is_valid, editor.get_text_in_format()[:2])
+    # expected output: True ['Igel\n', 'Maus\n']
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+from Editor import Editor
+from EditorValidator import Validator
+
+
+SIZES = (10**3, 10**4, 10**5, 10**6)
+# number of paragraphs of the benchmark documents
+EDITS = 1000
+# number of add_n/del_n/replace calls per measurement
+WIDTHS = (20, 80)
+# column widths for format fix
+
+WORDS = ("Hund", "Katze", "Maus", "und", "oder", "der", "die", "das", "ist",
+         "nicht", "Lorem", "ipsum", "dolor", "sit", "amet,", "Zürich.",
+         "Winterthur", "laufen", "schnell", "über", "den", "Zaun!", "(Text)",
+         "consectetur", "adipiscing", "elit", "sed", "eiusmod", "tempor")
+
+
+def make_paragraphs(count, seed=0):
+    """
+    Creates a reproducible text with count paragraphs of 5 to 60 words.
+
+    Parameters
+    ----------
+    count : int
+    seed : int
+
+    Returns
+    -------
+    paragraphs : list
+
+    """
+    generator = random.Random(seed)
+    choices = generator.choices
+    return [" ".join(choices(WORDS, k=generator.randint(5, 60)))
+            for _ in range(count)]
+
+
+def benchmarks(editor, validator, paragraphs):
+    """
+    Returns the benchmarks for one document. Every benchmark leaves the text
+    as it was, so they can run in any order and be repeated.
+
+    Parameters
+    ----------
+    editor : Editor
+        editor with the document
+    validator : Validator
+    paragraphs : list
+        paragraphs of the document
+
+    Returns
+    -------
+    benchmarks : dict
+        key: name, value: (function, calls), calls is the number of
+        operations one run of the function performs. A function may return
+        the time it measured itself, else the whole call is timed
+
+    """
+    size = len(paragraphs)
+    edits = min(EDITS, size)
+    cases = {}
+
+    def add_and_delete(n, timed):
+        # adds edits paragraphs at position n and deletes them again, only
+        # the adds (timed == "add") or only the deletes are timed
+        def run():
+            start = time.perf_counter()
+            for _ in range(edits):
+                editor.add_n("Neuer Absatz", n)
+            middle = time.perf_counter()
+            for _ in range(edits):
+                editor.del_n(n)
+            end = time.perf_counter()
+            return middle - start if timed == "add" else end - middle
+        return run
+
+    for name, n in (("head", 1), ("middle", size // 2), ("tail", size + 1)):
+        cases["add_n " + name] = (add_and_delete(n, "add"), edits)
+        cases["del_n " + name] = (add_and_delete(n, "del"), edits)
+
+    def format_fix_first(width):
+        def run():
+            # the first format fix after opening the text, nothing is cached
+            editor.change_format("fix", width)
+            for cache in editor.format_fix_caches.values():
+                cache.clear()
+            editor.token_cache = {}
+            editor.text_in_format_is_valid = False
+            editor.get_text_in_format()
+        return run
+
+    def change_width(width):
+        def run():
+            # the text was formatted for another width before, the words of
+            # long paragraphs were split then, only the line breaks are new
+            editor.change_format("fix", width)
+            editor.format_fix_cache.clear()
+            editor.text_in_format_is_valid = False
+            editor.get_text_in_format()
+        return run
+
+    for width in WIDTHS:
+        cases["format_fix first " + str(width)] = (format_fix_first(width), 1)
+        cases["change_width " + str(width)] = (change_width(width), 1)
+
+    def viewport():
+        # one screen in the middle of the text, the line counts are kept
+        # from the first run
+        editor.change_format("fix", WIDTHS[-1])
+        editor.text_in_format_is_valid = False
+        editor.viewport(editor.line_count() // 2, 50)
+    cases["viewport"] = (viewport, 1)
+
+    def format_raw():
+        editor.change_format("raw")
+        editor.text_in_format_is_valid = False
+        editor.get_text_in_format()
+    cases["format_raw"] = (format_raw, 1)
+
+    def index():
+        editor.drop_indexes()
+        editor.index()
+    cases["index"] = (index, 1)
+
+    numbers = random.Random(size).choices(range(1, size + 1), k=edits)
+
+    def replace():
+        for n in numbers:
+            editor.replace("Hund", "Hund", n)
+    cases["replace"] = (replace, edits)
+
+    def validate():
+        validate_new_paragraph = validator.validate_new_paragraph
+        for paragraph in paragraphs:
+            validate_new_paragraph(paragraph)
+    cases["validate_new_paragraph"] = (validate, size)
+    return cases
+
+
+def run_benchmarks(sizes=SIZES, repeat=3, report=print):
+    """
+    Runs all benchmarks for every document size.
+
+    Parameters
+    ----------
+    sizes : iterable
+        numbers of paragraphs
+    repeat : int
+        the best of repeat runs is taken
+    report : function
+        called with a line of text for every result
+
+    Returns
+    -------
+    results : dict
+        key: benchmark name, value: dict with the seconds per operation for
+        every size (the size is a str, as in JSON)
+
+    """
+    results = {}
+    validator = Validator([], [], [])
+    for size in sizes:
+        paragraphs = make_paragraphs(size)
+        editor = Editor()
+        editor.set_history_limit(0)  # no snapshots kept between runs
+        editor.set_text(paragraphs)
+        for name, (function, calls) in benchmarks(editor, validator,
+                                                  paragraphs).items():
+            best = math.inf
+            for _ in range(repeat):
+                start = time.perf_counter()
+                elapsed = function()
+                if elapsed is None:
+                    elapsed = time.perf_counter() - start
+                best = min(best, elapsed)
+            seconds = best / calls
+            results.setdefault(name, {})[str(size)] = seconds
+            report(f"{name:<24}{size:>9} {seconds * 1e6:>14.2f} us/op "
+                   f"{1 / seconds if seconds else math.inf:>14.0f} op/s")
+        editor.close()
+    return results
+
+
+def scaling_exponent(timings):
+    """
+    Fits seconds = c * size ** k by least squares on a log-log scale. k is
+    about 0 for O(1), 1 for O(n) and 2 for O(n^2) per operation.
+
+    Parameters
+    ----------
+    timings : dict
+        key: size, value: seconds per operation
+
+    Returns
+    -------
+    k : float
+        None if there are less than two sizes
+
+    """
+    points = [(math.log(int(size)), math.log(seconds))
+              for size, seconds in timings.items() if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def compare(results, baseline, tolerance=0.25):
+    """
+    Compares results with a baseline of an earlier run.
+
+    Parameters
+    ----------
+    results : dict
+        result of run_benchmarks
+    baseline : dict
+        result of an earlier run_benchmarks
+    tolerance : float
+        a benchmark is a regression if it is more than tolerance slower
+
+    Returns
+    -------
+    regressions : list
+        tuples (name, size, ratio) of the benchmarks that got slower
+
+    """
+    regressions = []
+    for name, timings in results.items():
+        for size, seconds in timings.items():
+            old_seconds = baseline.get(name, {}).get(size)
+            if old_seconds and seconds / old_seconds > 1 + tolerance:
+                regressions.append((name, int(size), seconds / old_seconds))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Benchmarks of the editor")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="numbers of paragraphs, default: 10^3 to 10^6")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="the best of REPEAT runs is taken")
+    parser.add_argument("--save", metavar="JSON",
+                        help="write the results as baseline to a file")
+    parser.add_argument("--compare", metavar="JSON",
+                        help="compare the results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, "
+                             "default: 0.25 (25 percent)")
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(arguments.sizes, arguments.repeat)
+    exponents = {name: scaling_exponent(timings)
+                 for name, timings in results.items()}
+    print("\nScaling exponent (seconds per operation ~ n^k)")
+    for name, exponent in exponents.items():
+        if exponent is not None:
+            print(f"{name:<24}{exponent:>6.2f}")
+
+    if arguments.save:
+        with open(arguments.save, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "results": results,
+                       "exponents": exponents}, file, indent=2)
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline["results"],
+                              arguments.tolerance)
+        print("\nRegressions against", arguments.compare)
+        for name, size, ratio in regressions:
+            print(f"{name:<24}{size:>9} {ratio:>6.2f}x slower")
+        if not regressions:
+            print("None")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
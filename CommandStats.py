@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Command Stats """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import math
+import time
+
+
+PHASES = ("split", "validate", "run", "output")
+# split_command, Validator.input_is_valid, the editor method without its
+# output, and writing the output
+INVALID_COMMAND = "?"
+# name under which all input that is not a command is recorded, so typos do
+# not add rows
+
+
+class LatencyHistogram:
+
+    GROWTH = 2 ** (1 / 8)
+    # bucket i counts the latencies from GROWTH**i to GROWTH**(i+1) seconds,
+    # so a percentile is at most 9 % too high and the memory does not grow
+    # with the number of calls
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds):
+        """
+        Adds a measured latency.
+
+        Parameters
+        ----------
+        seconds : float
+
+        Returns
+        -------
+        None.
+
+        """
+        bucket = math.floor(math.log(max(seconds, 1e-9), self.GROWTH))
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, percent):
+        """
+        Returns the latency that percent of the calls did not exceed.
+
+        Parameters
+        ----------
+        percent : float
+            e.g. 95 for p95
+
+        Returns
+        -------
+        seconds : float
+            upper end of the bucket that contains the percentile, 0.0 if
+            there were no calls
+
+        """
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.GROWTH ** (bucket + 1), self.maximum)
+        return 0.0
+
+
+class CommandStats:
+
+    def __init__(self):
+        self.histograms = {}
+        # key: (command, phase), value: LatencyHistogram
+
+    def record(self, command, phase, seconds):
+        """
+        Records the time of one phase of a command.
+
+        Parameters
+        ----------
+        command : str
+            name of the command, e.g. 'ADD', or INVALID_COMMAND
+        phase : str
+            one of PHASES
+        seconds : float
+
+        Returns
+        -------
+        None.
+
+        """
+        key = (command, phase)
+        if key not in self.histograms:
+            self.histograms[key] = LatencyHistogram()
+        self.histograms[key].add(seconds)
+
+    def report(self):
+        """
+        Returns a table with count, total time and p50/p95/p99 of every
+        command and phase.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        lines : list
+
+        """
+        width = max([len("command")] + [len(command) for command, _
+                                         in self.histograms]) + 2
+        # the command column fits the longest name, e.g. 'PRINT CHANGES'
+        lines = [f"{'command':<{width}}{'phase':<10}{'calls':>8}"
+                 f"{'total ms':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"]
+        order = {phase: number for number, phase in enumerate(PHASES)}
+        for command, phase in sorted(self.histograms, key=lambda key: (
+                key[0], order.get(key[1], len(order)))):
+            histogram = self.histograms[command, phase]
+            lines.append(
+                f"{command:<{width}}{phase:<10}{histogram.count:>8}"
+                f"{histogram.total * 1000:>12.3f}"
+                + "".join(f"{histogram.percentile(percent) * 1000:>10.3f}"
+                          for percent in (50, 95, 99)))
+        return lines
+
+
+class TimedOutput:
+
+    def __init__(self, stream):
+        # wraps an output stream and adds up the time spent in write()
+        self.stream = stream
+        self.elapsed = 0.0
+
+    def write(self, text):
+        start = time.perf_counter()
+        written = self.stream.write(text)
+        self.elapsed += time.perf_counter() - start
+        return written
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+if __name__ == "__main__":
+    print("\nTest: LatencyHistogram")
+    histogram = LatencyHistogram()
+    for milliseconds in range(1, 101):
+        histogram.add(milliseconds / 1000)
+    print(0.050 <= histogram.percentile(50) <= 0.055)  # expected output: True
+    print(histogram.percentile(100))  # expected output: 0.1
+
+    print("\nTest: CommandStats")
+    stats = CommandStats()
+    stats.record("ADD", "run", 0.002)
+    stats.record("ADD", "split", 0.001)
+    print("\n".join(stats.report()))
+    # expected output: a table with the rows ADD split and ADD run
+    stats.record("PRINT CHANGES", "split", 0.001)
+    print(stats.report()[-1].split()[:3])
+    # expected output: ['PRINT', 'CHANGES', 'split']
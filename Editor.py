@@ -13,18 +13,113 @@ __maintainer__ = 'Lars Schneckenburger'
 __email__      = 'schnela@students.zhaw.ch'
 __status__     = 'done'
 
-import string
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from AhoCorasick import Automaton, substitute
+from Journal import Journal
+from LineCounts import LineCounts
+from ParagraphIds import ParagraphIds
+from ParagraphPool import ParagraphPool
+from ParagraphStore import MappedParagraphStore, TreeParagraphStore
+from ParagraphTokens import ParagraphTokens
+from PrintedOutput import PrintedOutput, fingerprint, line_hashes
+from TermIndex import TermIndex
+from TrigramIndex import TrigramIndex
+from WordWrap import wrap_many, wrap_paragraph
+
+
+def _offsets(paragraph, search):
+    # all positions of search in paragraph, also overlapping ones
+    offsets = []
+    offset = paragraph.find(search)
+    while offset >= 0:
+        offsets.append(offset)
+        offset = paragraph.find(search, offset + 1)
+    return offsets
 
 
 class Editor:
 
-    def __init__(self):
-        self.text = []
-        # the input text is saved in a list. 
+    def __init__(self, store=None):
+        self.text = store if store is not None else TreeParagraphStore()
+        self.store_factory = type(self.text)
+        # creates the store for a new text from a list of paragraphs, e.g.
+        # when a saved text is opened (see set_store_factory)
+        self.pool = ParagraphPool(getattr(self.text, "resident", True))
+        # paragraphs with the same content share one string and one entry
+        # in format_fix_cache (see ParagraphPool)
+        self.cache_paragraphs = self.pool.enabled
+        # False for a store that does not keep its paragraphs as strings
+        # (see CompressedParagraphStore, MappedParagraphStore): the caches
+        # below are keyed by paragraph and would keep every paragraph that
+        # was read as a string, so nothing is cached per paragraph then
+        # the input text is saved in a paragraph store (see ParagraphStore).
         # each element represents a paragraph.
         self.text_in_format = []
         # second list for the text, where the rules of the format is applied
         self.current_format = ("raw", 0)
+        self.text_in_format_is_valid = False
+        # True as long as text_in_format matches text and current_format
+        self.format_fix_cache = {}
+        self.format_fix_width = 0
+        # formatted lines of every paragraph for the column width
+        # format_fix_width. key: paragraph, value: tuple with its lines
+        self.format_fix_caches = OrderedDict([(0, self.format_fix_cache)])
+        self.format_widths_kept = 3
+        # format_fix_cache of the last format_widths_kept column widths,
+        # key: width, the current width last. Switching back to one of them
+        # reuses its lines
+        self.token_cache = {}
+        # words of every paragraph that was formatted or indexed, they do
+        # not depend on the width. key: paragraph, value: ParagraphTokens
+        self.paragraph_ids = None
+        self.term_index = None
+        self.trigram_index = None
+        # the ids are created with the first index, the term index by the
+        # first call of index() and the trigram index by the first call of
+        # find(). They are kept up to date by every edit after that
+        self.word_index = None  # result of index(), None if outdated
+        self.line_counts = None
+        self.line_counts_width = 0
+        # output lines of every paragraph in format fix for the column width
+        # line_counts_width (see LineCounts). Created by the first viewport
+        # call, then kept up to date by every edit; after a change of the
+        # width only the paragraphs longer than one of the widths are
+        # counted again (see get_line_counts)
+        self.printed = None
+        # fingerprints of the output of the last print_changes and the edits
+        # since then (see PrintedOutput), None before the first call
+        self.cache_lock = threading.Lock()
+        self.build_lock = threading.RLock()
+        # commands that only read the text (see commands_reading_text) may
+        # run at the same time (see EditorServer). They add to the caches
+        # above under cache_lock, and only one of them at a time builds
+        # text_in_format, the ids, the indexes or the line counts, under
+        # build_lock
+        self.parallel_workers = 0
+        self.parallel_threshold = 100000
+        self.parallel_shard_size = 5000
+        self.process_pool = None
+        # format fix runs in parallel_workers processes for texts with at
+        # least parallel_threshold paragraphs (see set_parallel)
+        self.listeners = []
+        # functions that are called after every change (see add_listener)
+        self.version = 0
+        # number of changes (see notify), e.g. to notice that a result that
+        # was computed in the background is outdated
+        self.journal = None  # journal of the text after SAVE or OPEN
+        self.undo_history = deque()
+        self.redo_history = []
+        # snapshots of the text (see ParagraphStore) with their estimated
+        # memory, the newest snapshot is at the end
+        self.history_memory = 0
+        self.history_memory_limit = 64 * 2**20
+        # the oldest snapshots are dropped when the history needs more
+        # bytes than history_memory_limit
         self.dummy = "Lorem ipsum dolor sit amet, consectetur adipiscing " \
                      "elit, sed do eiusmod tempor incididunt ut labore et " \
                      "dolore magna aliqua. Ut enim ad minim veniam, quis " \
@@ -35,154 +130,975 @@ class Editor:
                      "cupidatat non proident, sunt in culpa qui officia " \
                      "deserunt mollit anim id est laborum."  # dummy text
 
-        self.commands = ["ADD", "DEL", "DUMMY", "EXIT", "FORMAT RAW",
-                         "FORMAT FIX", "INDEX", "PRINT", "REPLACE"]
-        # list with possible and valid commands for user
-        self.commands_with_parameter = ["ADD", "DEL", "DUMMY",
-                                        "FORMAT FIX", "REPLACE"]
-        
-        self.commands_adding_text = ["ADD", "DUMMY"]
+        self.commands = ["ADD", "CLOSE", "DEL", "DUMMY", "EXIT", "FIND",
+                         "FORMAT RAW", "FORMAT FIX", "INDEX", "LOAD", "OPEN",
+                         "PRINT", "PRINT CHANGES", "MEMORY", "REDO",
+                         "REPLACE", "REPLACE ALL",
+                         "SAVE", "STATS", "SWITCH", "UNDO"]
+        # list with possible and valid commands for user
+        self.commands_with_parameter = ["ADD", "DEL", "DUMMY",
+                                        "FORMAT FIX", "PRINT", "REPLACE",
+                                        "REPLACE ALL"]
+        self.commands_with_range = ["ADD", "DEL", "DUMMY", "PRINT",
+                                    "REPLACE ALL"]
+        # commands that accept two paragraph numbers 'n m' or 'n-m' as
+        # parameter. For ADD and DUMMY these are the numbers of the new
+        # paragraphs, also written as 'n xk' for k paragraphs
+        self.commands_with_argument = ["FIND", "LOAD", "OPEN", "SAVE"]
+        # commands followed by a text argument, e.g. 'LOAD <path>'
+        self.commands_searching_text = ["FIND"]
+        # their argument is taken as it is, with leading and trailing
+        # spaces, like the search text of REPLACE
+        self.commands_with_optional_argument = ["CLOSE", "SWITCH"]
+        # commands that may be followed by a text argument, e.g. 'SWITCH' or
+        # 'SWITCH <name>'
+        
+        self.commands_adding_text = ["ADD", "DUMMY"]
+        self.commands_reading_text = ["EXIT", "FIND", "INDEX", "PRINT",
+                                      "STATS"]
+        # commands that do not change the text, several of them may run at
+        # the same time (see EditorServer)
+
+
+    def get_commands(self):
+        """
+        Get list with valid/possible commands.
+        
+        Parameters
+        ----------
+        None.
+    
+        Returns
+        -------
+        self.commands : list
+            list with valid/possible commands
+        """
+        return self.commands
+
+    def set_parallel(self, workers, threshold=100000):
+        """
+        Enables the parallel format fix. The paragraphs are sent in shards to
+        a pool of worker processes, the lines come back in the original
+        order. Texts with less than threshold paragraphs are still formatted
+        in this process, because sending the paragraphs costs more than
+        wrapping them.
+
+        Parameters
+        ----------
+        workers : int
+            number of worker processes, 0 or 1 to disable
+        threshold : int
+            minimum number of paragraphs for the parallel format
+
+        Returns
+        -------
+        None.
+
+        """
+        self.stop_workers()
+        self.parallel_workers = workers
+        self.parallel_threshold = threshold
+
+    def close(self):
+        """
+        Stops the worker processes of the parallel format fix and closes the
+        file of a loaded text (see load). The editor is not used afterwards.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.stop_workers()
+        if hasattr(self.text, "close"):
+            self.text.close()
+
+    def stop_workers(self):
+        """
+        Stops the worker processes of the parallel format fix, they are
+        started again by the next parallel format.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+
+    def get_paragraph_count(self):
+        """
+        Get the number of paragraphs in the text.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        count : int
+            number of paragraphs
+        """
+        return len(self.text)
+
+    def add_listener(self, listener):
+        """
+        Registers a function that is called after every change of the text
+        or the format with the name of the editor method and its arguments,
+        e.g. listener("add_n", ("Hund", 3)).
+
+        Parameters
+        ----------
+        listener : function
+
+        Returns
+        -------
+        None.
+
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Removes a function that was registered with add_listener.
+
+        Parameters
+        ----------
+        listener : function
+
+        Returns
+        -------
+        None.
+
+        """
+        self.listeners.remove(listener)
+
+    def notify(self, operation, *arguments):
+        """
+        Counts a change in version and calls all listeners.
+
+        Parameters
+        ----------
+        operation : str
+            name of the editor method that changed the text
+        arguments : tuple
+            arguments of the method
+
+        Returns
+        -------
+        None.
+
+        """
+        self.version += 1
+        for listener in self.listeners:
+            listener(operation, arguments)
+
+    def set_store_factory(self, store_factory):
+        """
+        Changes how the text is stored (see ParagraphStore). The current
+        text is moved into a new store.
+
+        Parameters
+        ----------
+        store_factory : function
+            creates a store from a list of paragraphs, e.g.
+            TreeParagraphStore or a functools.partial of
+            CompressedParagraphStore with its options
+
+        Returns
+        -------
+        None.
+
+        """
+        self.store_factory = store_factory
+        self.set_text(list(self.text))
+
+    def set_text(self, paragraphs):
+        """
+        Replaces the whole text with new paragraphs.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+
+        Returns
+        -------
+        None.
+
+        """
+        pool = ParagraphPool()
+        text = self.store_factory(map(pool.intern, paragraphs))
+        self.replace_store(text, pool if getattr(text, "resident", True)
+                           else None)
+        self.notify("set_text")
+
+    def replace_store(self, text, pool=None):
+        """
+        Replaces the paragraph store and drops everything that was computed
+        for the old text.
+
+        Parameters
+        ----------
+        text : paragraph store (see ParagraphStore)
+        pool : ParagraphPool
+            pool of the paragraphs in text. Default is an empty pool
+
+        Returns
+        -------
+        None.
+
+        """
+        if hasattr(self.text, "close"):
+            self.text.close()
+        self.text = text
+        if pool is None:
+            pool = ParagraphPool(getattr(text, "resident", True))
+        self.pool = pool
+        self.cache_paragraphs = pool.enabled
+        self.text_in_format_is_valid = False
+        self.format_fix_cache = {}
+        self.format_fix_caches = OrderedDict([(self.format_fix_width,
+                                               self.format_fix_cache)])
+        self.token_cache = {}
+        self.drop_indexes()
+        if self.printed is not None:
+            self.printed.forget()
+        self.clear_history()
+
+    def save(self, path):
+        """
+        Saves the text in a journal (see Journal). Saving to the same path
+        again only appends the edits since the last save.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.journal is None or self.journal.path != path:
+            journal = Journal(path)
+            journal.checkpoint(self)
+            self.set_journal(journal)
+        else:
+            self.journal.save(self)
+
+    def open(self, path):
+        """
+        Opens a text that was saved with save. The newest checkpoint is read
+        and the edits that were saved after it are replayed.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        None.
+
+        """
+        journal = Journal(path)
+        self.set_journal(None)
+        journal.restore(self)
+        self.clear_history()  # UNDO must not undo the replayed edits
+        self.set_journal(journal)
+
+    def set_journal(self, journal):
+        # the journal records every change after it was set
+        if self.journal is not None:
+            self.remove_listener(self.journal.record)
+        self.journal = journal
+        if journal is not None:
+            self.add_listener(journal.record)
+
+    def load(self, path):
+        """
+        Replaces the text with the content of a file, every line of the file
+        is a paragraph. The file is memory-mapped and a paragraph is only
+        read when it is formatted, indexed or edited (see
+        MappedParagraphStore). Edits do not change the file.
+
+        Parameters
+        ----------
+        path : str
+            path of the text file
+
+        Returns
+        -------
+        None.
+
+        """
+        self.replace_store(MappedParagraphStore(path))
+        self.notify("load", path)
+
+    def set_history_limit(self, memory_limit):
+        """
+        Sets the memory that the UNDO/REDO history may use.
+
+        Parameters
+        ----------
+        memory_limit : int
+            bytes, 0 turns the history off
+
+        Returns
+        -------
+        None.
+
+        """
+        self.history_memory_limit = memory_limit
+        self.trim_history()
+
+    def remember(self, *removed, snapshot=None, edits=1):
+        """
+        Saves a snapshot of the text before an edit. Redo is no longer
+        possible after a new edit.
+
+        Parameters
+        ----------
+        removed : str
+            paragraphs that the edit removes, they stay in memory as long as
+            the snapshot is kept
+        snapshot : object
+            snapshot taken before the edit, if the edit already happened.
+            Default is a snapshot of the current text
+        edits : int
+            number of paragraphs the edit changes
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.redo_history:
+            self.redo_history = []
+            self.history_memory = sum(memory for _, memory
+                                      in self.undo_history)
+        if snapshot is None:
+            snapshot = self.text.snapshot()
+        memory = self.text.snapshot_size(edits) + sum(map(sys.getsizeof,
+                                                          removed))
+        self.undo_history.append((snapshot, memory))
+        self.history_memory += memory
+        self.trim_history()
+
+    def clear_history(self):
+        """
+        Drops all UNDO/REDO snapshots.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.undo_history.clear()
+        self.redo_history = []
+        self.history_memory = 0
+
+    def trim_history(self):
+        # drops the oldest snapshots until the history fits into the limit
+        while self.history_memory > self.history_memory_limit and \
+                (self.undo_history or self.redo_history):
+            if self.undo_history:
+                _, memory = self.undo_history.popleft()
+            else:
+                _, memory = self.redo_history.pop(0)
+            self.history_memory -= memory
+
+    def undo(self):
+        """
+        Goes back to the text before the last edit.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        done : bool
+            False if there is nothing to undo
+
+        """
+        if not self.undo_history:
+            return False
+        snapshot, memory = self.undo_history.pop()
+        self.redo_history.append((self.text.snapshot(), memory))
+        self.restore_snapshot(snapshot)
+        self.notify("undo")
+        return True
+
+    def redo(self):
+        """
+        Repeats the last edit that was undone.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        done : bool
+            False if there is nothing to redo
+
+        """
+        if not self.redo_history:
+            return False
+        snapshot, memory = self.redo_history.pop()
+        self.undo_history.append((self.text.snapshot(), memory))
+        self.restore_snapshot(snapshot)
+        self.notify("redo")
+        return True
+
+    def restore_snapshot(self, snapshot):
+        # the formatted lines of a paragraph do not change, only the
+        # positions of the paragraphs, so the index is built again
+        self.text.restore(snapshot)
+        self.text_in_format_is_valid = False
+        for paragraph in self.pool.recount(self.text):
+            # the counts belonged to the replaced text, later releases would
+            # drop or keep the caches of a content wrongly
+            for cache in self.format_fix_caches.values():
+                cache.pop(paragraph, None)
+            self.token_cache.pop(paragraph, None)
+        self.drop_indexes()
+        if self.printed is not None:
+            self.printed.forget()
+
+    def drop_indexes(self):
+        """
+        Removes the term and the trigram index and the line counts, they
+        are built again when they are needed.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.paragraph_ids = None
+        self.term_index = None
+        self.trigram_index = None
+        self.word_index = None
+        self.line_counts = None
+
+    def add_n(self, paragraph, n):
+        """
+        Method adds a new paragraph. The paragraph is inserted at position n.
+        
+        Parameters
+        ----------
+        paragraph : str
+        n : int
+            position for new paragraph as int
+    
+        Returns
+        -------
+        None.
+    
+        """
+        self.remember()
+        paragraph = self.pool.intern(paragraph)
+        self.text.insert(n-1, paragraph)
+        self.paragraph_added(n-1, paragraph)
+        self.notify("add_n", paragraph, n)
+
+    def del_n(self, n):
+        """
+        Deletes a paragraph. 
+    
+        Parameters
+        ----------
+        n : int 
+            position of paragraph to be deleted as int
+    
+        Returns
+        -------
+        None.
+    
+        """
+        self.remember(self.text[n-1])
+        paragraph = self.text.pop(n-1)
+        self.paragraph_removed(n-1, paragraph)
+        self.notify("del_n", n)
+
+    def dummy_n(self, n):
+        """
+        Inserts a permanently programmed dummy text.
+
+        Parameters
+        ----------
+        n : int
+            position for new paragraph as int
+
+        Returns
+        -------
+        None.
+
+        """
+        self.remember()
+        self.text.insert(n-1, self.pool.intern(self.dummy))
+        self.paragraph_added(n-1, self.dummy)
+        self.notify("dummy_n", n)
+
+    def add_many(self, paragraphs, n):
+        """
+        Inserts several paragraphs at once, the first one at position n.
+        The text is changed once in O(n + k) instead of k times.
+
+        Parameters
+        ----------
+        paragraphs : list
+        n : int
+            position for the first new paragraph as int
+
+        Returns
+        -------
+        None.
+
+        """
+        paragraphs = [self.pool.intern(paragraph) for paragraph in paragraphs]
+        self.insert_paragraphs(paragraphs, n)
+        self.notify("add_many", paragraphs, n)
+
+    def del_range(self, n, m):
+        """
+        Deletes the paragraphs n to m at once.
+
+        Parameters
+        ----------
+        n : int
+            position of the first paragraph to be deleted as int
+        m : int
+            position of the last paragraph to be deleted as int
+
+        Returns
+        -------
+        None.
+
+        """
+        snapshot = self.text.snapshot()
+        removed = self.text.delete_range(n-1, m)
+        self.remember(*removed, snapshot=snapshot, edits=len(removed))
+        for paragraph in removed:
+            self.paragraph_removed(n-1, paragraph)
+        self.notify("del_range", n, m)
+
+    def dummy_many(self, n, k):
+        """
+        Inserts k dummy paragraphs at once, the first one at position n.
+
+        Parameters
+        ----------
+        n : int
+            position for the first new paragraph as int
+        k : int
+            number of dummy paragraphs
+
+        Returns
+        -------
+        None.
+
+        """
+        self.insert_paragraphs([self.pool.intern(self.dummy)
+                                for _ in range(k)], n)
+        self.notify("dummy_many", n, k)
+
+    def insert_paragraphs(self, paragraphs, n):
+        # inserts interned paragraphs for add_many and dummy_many
+        self.remember(edits=len(paragraphs))
+        self.text.insert_many(n-1, paragraphs)
+        for offset, paragraph in enumerate(paragraphs):
+            self.paragraph_added(n-1 + offset, paragraph)
+
+    def format_raw(self):
+        """
+        Sets the output format to output paragraphs preceded by paragraph
+        numbers. This is the default behavior.
+
+        Parameters
+        ----------
+        None.
+    
+        Returns
+        -------
+        None.
+    
+        """
+        self.text_in_format = list(self.iter_format_raw(self.text, 1))
+
+    def iter_format_raw(self, paragraphs, counter):
+        """
+        Yields paragraphs preceded by their paragraph numbers.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+        counter : int
+            paragraph number of the first paragraph
+
+        Returns
+        -------
+        lines : generator
+
+        """
+        for paragraph in paragraphs:
+            yield str(counter) + " : " + paragraph
+            counter += 1
+
+    def format_fix(self):
+        """
+        Sets the output format to output with a maximum column width of b
+        characters. The wrapping behavior is as follows:
+            - Wrapping is only allowed after a space character.
+            - The space after which a break is made does not count towards the
+            line length. It will still be printed on the current line, even if
+            it may no longer fit on it.
+            - If there is no break within the column width after a break, you
+            can use the column width, it is allowed to wrap after the column
+            width.
+    
+        Parameters
+        ----------
+        None.
+    
+        Returns
+        -------
+        None.
+    
+        """
+        self.text_in_format = list(self.iter_format_fix(self.text,
+                                                        len(self.text)))
+
+    def iter_format_fix(self, paragraphs, count=0):
+        """
+        Yields the lines of paragraphs in format fix. Paragraphs that were
+        formatted before are taken from the cache.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+        count : int
+            number of paragraphs, decides if the parallel format is used
+
+        Returns
+        -------
+        lines : generator
+
+        """
+        if self.parallel_workers > 1 and count >= self.parallel_threshold:
+            yield from self.iter_format_fix_parallel(paragraphs)
+            return
+        if not self.cache_paragraphs:
+            for paragraph in paragraphs:
+                yield from self.format_fix_paragraph(paragraph)
+            return
+        cache = self.format_fix_cache
+        for paragraph in paragraphs:
+            lines = cache.get(paragraph)
+            if lines is None:  # paragraph is new or was changed
+                lines = self.format_fix_paragraph(paragraph)
+                with self.cache_lock:
+                    cache[paragraph] = lines
+            yield from lines
 
+    def iter_format_fix_parallel(self, paragraphs):
+        """
+        Yields the lines of paragraphs in format fix like iter_format_fix.
+        The paragraphs that are not in the cache are wrapped by the worker
+        processes. A few shards are formatted ahead, so the memory does not
+        grow with the size of the text.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+
+        Returns
+        -------
+        lines : generator
 
-    def get_commands(self):
         """
-        Get list with valid/possible commands.
-        
+        with self.cache_lock:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(self.parallel_workers)
+        pending = deque()  # shards that are formatted by the workers
+        shard = []
+        for paragraph in paragraphs:
+            shard.append(paragraph)
+            if len(shard) == self.parallel_shard_size:
+                pending.append(self.submit_shard(shard))
+                shard = []
+                if len(pending) > 2 * self.parallel_workers:
+                    yield from self.collect_shard(*pending.popleft())
+        if shard:
+            pending.append(self.submit_shard(shard))
+        while pending:
+            yield from self.collect_shard(*pending.popleft())
+
+    def submit_shard(self, shard):
+        # sends the paragraphs of a shard that are not cached to a worker
+        cache = self.format_fix_cache if self.cache_paragraphs else {}
+        missing = [paragraph for paragraph in dict.fromkeys(shard)
+                   if paragraph not in cache]
+        future = None
+        if missing:
+            future = self.process_pool.submit(wrap_many, missing,
+                                              self.format_fix_width)
+        return shard, missing, future
+
+    def collect_shard(self, shard, missing, future):
+        # stores the result of a worker in the cache and yields the lines,
+        # without cache only for the time of the shard
+        cache = self.format_fix_cache if self.cache_paragraphs else {}
+        if future is not None:
+            results = future.result()
+            with self.cache_lock:
+                cache.update(zip(missing, results))
+        for paragraph in shard:
+            lines = cache.get(paragraph)
+            if lines is None:
+                lines = self.format_fix_paragraph(paragraph)
+                with self.cache_lock:
+                    cache[paragraph] = lines
+            yield from lines
+
+    def format_fix_paragraph(self, paragraph, b=None):
+        """
+        Wraps a single paragraph to the column width of the current format
+        according to the rules described in format_fix (see WordWrap). The
+        words are taken from the token cache, which the index shares (see
+        tokens), so wrapping a paragraph again for another width only
+        searches the line breaks.
+
         Parameters
         ----------
-        None.
-    
+        paragraph : str
+        b : int
+            maximum column width, default is the one of the current format
+
         Returns
         -------
-        self.commands : list
-            list with valid/possible commands
+        lines : tuple
+            The lines of the paragraph, the last one ends with a newline
+
         """
-        return self.commands
+        if b is None:
+            b = self.format_fix_width
+        return wrap_paragraph(paragraph, b, self.tokens(paragraph))
 
-    def add_n(self, paragraph, n):
+    def count_lines(self, paragraph, b):
         """
-        Method adds a new paragraph. The paragraph is inserted at position n.
-        
+        Returns the number of lines of a paragraph in format fix with the
+        column width b. A paragraph that is not longer than b is a single
+        line, all others are wrapped (and cached for the current width).
+
         Parameters
         ----------
         paragraph : str
-        n : int
-            position for new paragraph as int
-    
+        b : int
+            maximum column width
+
         Returns
         -------
+        count : int
+
+        """
+        if len(paragraph) <= b:
+            return 1
+        if b != self.format_fix_width:
+            return len(self.format_fix_paragraph(paragraph, b))
+        return len(self.format_fix_lines(paragraph))
+
+    def format_fix_lines(self, paragraph):
+        # lines of a paragraph in format fix from the cache, the paragraph is
+        # wrapped and cached if it is not in the cache
+        lines = self.format_fix_cache.get(paragraph)
+        if lines is None:
+            lines = self.format_fix_paragraph(paragraph)
+            if self.cache_paragraphs:
+                with self.cache_lock:
+                    self.format_fix_cache[paragraph] = lines
+        return lines
+
+    def get_line_counts(self):
+        """
+        Returns the output lines of every paragraph in format fix for the
+        current column width (see LineCounts). They are counted on the
+        first call. After a change of the width only the paragraphs that
+        are longer than the old or the new width are counted again, all
+        others stay a single line.
+
+        Parameters
+        ----------
         None.
-    
+
+        Returns
+        -------
+        line_counts : LineCounts
+
         """
-        self.text.insert(n-1, paragraph)
+        b = self.format_fix_width
+        with self.build_lock:
+            if self.line_counts is None:
+                self.line_counts = LineCounts(self.count_lines(paragraph, b)
+                                              for paragraph in self.text)
+            elif self.line_counts_width != b:
+                shorter = min(b, self.line_counts_width)
+                line_counts = self.line_counts
+                for index, paragraph in enumerate(self.text):
+                    if len(paragraph) > shorter:
+                        line_counts[index] = self.count_lines(paragraph, b)
+            self.line_counts_width = b
+            return self.line_counts
 
-    def del_n(self, n):
+    def tokens(self, paragraph):
         """
-        Deletes a paragraph. 
-    
+        Returns the words of a paragraph (see ParagraphTokens). They are
+        found on the first call and kept until no paragraph with the same
+        content is left, so format fix and the index split a paragraph only
+        once.
+
         Parameters
         ----------
-        n : int 
-            position of paragraph to be deleted as int
-    
+        paragraph : str
+
         Returns
         -------
-        None.
-    
+        tokens : ParagraphTokens
+
         """
-        self.text.pop(n-1)
+        tokens = self.token_cache.get(paragraph)
+        if tokens is None:
+            tokens = ParagraphTokens(paragraph)
+            if self.cache_paragraphs:
+                with self.cache_lock:
+                    tokens = self.token_cache.setdefault(paragraph, tokens)
+        return tokens
 
-    def dummy_n(self, n):
+    def capital_terms(self, paragraph):
+        # terms of a paragraph for the term index (see TermIndex)
+        return self.tokens(paragraph).capital_terms(paragraph)
+
+    def paragraph_added(self, index, paragraph):
         """
-        Inserts a permanently programmed dummy text.
+        Updates the formatted text and the index after a paragraph was
+        inserted into the text.
 
         Parameters
         ----------
-        n : int
-            position for new paragraph as int
+        index : int
+            position that was passed to text.insert
+        paragraph : str
+            The new paragraph
 
         Returns
         -------
         None.
 
         """
-        self.text.insert(n-1, self.dummy)
+        self.text_in_format_is_valid = False
+        if self.line_counts is not None:
+            self.line_counts.insert(index, self.count_lines(
+                paragraph, self.line_counts_width))
+        if self.printed is not None:
+            self.printed.inserted(index)
+        if self.paragraph_ids is not None:
+            paragraph_id = self.paragraph_ids.insert(index)
+            if self.term_index is not None:
+                self.term_index.add(paragraph_id, paragraph)
+                self.word_index = None
+            if self.trigram_index is not None:
+                self.trigram_index.add(paragraph_id, paragraph)
 
-    def format_raw(self):
+    def paragraph_removed(self, index, paragraph):
         """
-        Sets the output format to output paragraphs preceded by paragraph
-        numbers. This is the default behavior.
+        Updates the formatted text and the index after a paragraph was
+        removed from the text. The formatted lines of the paragraph are
+        removed from the cache if no other paragraph has the same content.
 
         Parameters
         ----------
-        None.
-    
+        index : int
+            position that was passed to text.pop
+        paragraph : str
+            The removed paragraph
+
         Returns
         -------
         None.
-    
+
         """
-        self.text_in_format = []
-        counter = 1
-        for paragraph in self.text:
-            self.text_in_format.append((str(counter) + " : " + paragraph))
-            counter += 1
+        if self.pool.release(paragraph):
+            for cache in self.format_fix_caches.values():
+                cache.pop(paragraph, None)
+            self.token_cache.pop(paragraph, None)
+        self.text_in_format_is_valid = False
+        if self.line_counts is not None:
+            self.line_counts.pop(index)
+        if self.printed is not None:
+            self.printed.removed(index)
+        if self.paragraph_ids is not None:
+            paragraph_id = self.paragraph_ids.pop(index)
+            if self.term_index is not None:
+                self.term_index.remove(paragraph_id)
+                self.word_index = None
+            if self.trigram_index is not None:
+                self.trigram_index.remove(paragraph_id)
 
-    def format_fix(self):
+    def paragraph_changed(self, index, paragraph, new_paragraph):
         """
-        Sets the output format to output with a maximum column width of b
-        characters. The wrapping behavior is as follows:
-            - Wrapping is only allowed after a space character.
-            - The space after which a break is made does not count towards the
-            line length. It will still be printed on the current line, even if
-            it may no longer fit on it.
-            - If there is no break within the column width after a break, you
-            can use the column width, it is allowed to wrap after the column
-            width.
-    
+        Updates the formatted text and the index after a paragraph was
+        replaced in place. The paragraph keeps its id.
+
         Parameters
         ----------
-        None.
-    
+        index : int
+            position of the paragraph
+        paragraph : str
+            The old paragraph
+        new_paragraph : str
+
         Returns
         -------
         None.
-    
+
         """
-        self.text_in_format = []
-        b = self.current_format[1]  # maximum column width
-        for paragraph in self.text:
-            split_paragraph = paragraph.split()  # get list with all words
-            new_word = ""
-            column = ""  # is necessary for empty paragraph
-            while split_paragraph:
-                column = new_word
-
-                while len(column) <= b:
-                    if not split_paragraph:
-                        break
-                    else:
-                        new_word = split_paragraph.pop(0)
-
-                    if len(column) == 0:  # first word in column
-                        column += new_word
-                    else:
-                        column += " " + new_word
-
-                if len(new_word) > b:  # word longer than b
-                    self.text_in_format.append(new_word[:-(len(new_word) - b)])
-                    new_word = new_word[b:]  # rest of the word
-                else:
-                    self.text_in_format.append(column[:-len(new_word)])
-            # handling last word in paragraph
-            if column == "":
-                self.text_in_format.append(column + "\n")
-            elif (len(self.text_in_format[len(self.text_in_format) - 1]) +
-                  len(new_word)) > b:
-                self.text_in_format.append(new_word+ "\n")
-            else:
-                self.text_in_format.pop()  # is necessary for empty paragraph
-                self.text_in_format.append(column + "\n")
+        if self.pool.release(paragraph):
+            for cache in self.format_fix_caches.values():
+                cache.pop(paragraph, None)
+            self.token_cache.pop(paragraph, None)
+        self.text_in_format_is_valid = False
+        if self.line_counts is not None:
+            self.line_counts[index] = self.count_lines(
+                new_paragraph, self.line_counts_width)
+        if self.printed is not None:
+            self.printed.changed(index)
+        if self.paragraph_ids is not None:
+            paragraph_id = self.paragraph_ids[index]
+            if self.term_index is not None:
+                self.term_index.remove(paragraph_id)
+                self.term_index.add(paragraph_id, new_paragraph)
+                self.word_index = None
+            if self.trigram_index is not None:
+                self.trigram_index.remove(paragraph_id)
+                self.trigram_index.add(paragraph_id, new_paragraph)
 
     def change_format(self, new_format, b=0):
         """
@@ -201,9 +1117,24 @@ class Editor:
     
         """
         if new_format == "raw":
-            self.current_format = ("raw", b)
+            new_format = ("raw", b)
         else:
-            self.current_format = ("fix", b)
+            new_format = ("fix", b)
+            if b != self.format_fix_width:
+                # all lines depend on the width, the words do not (see
+                # WordWrap.wrap_paragraph)
+                caches = self.format_fix_caches
+                if b not in caches:
+                    caches[b] = {}
+                    if len(caches) > self.format_widths_kept:
+                        caches.popitem(last=False)  # least recently used
+                caches.move_to_end(b)
+                self.format_fix_cache = caches[b]
+                self.format_fix_width = b
+        if new_format != self.current_format:
+            self.text_in_format_is_valid = False
+        self.current_format = new_format
+        self.notify("change_format", new_format[0], b)
 
     def index(self):
         """
@@ -211,6 +1142,9 @@ class Editor:
         times across all paragraphs. A term starts with a capital letter. The
         index lists the paragraphs where the respective term occurs as a
         comma-separated number sequence.
+        The index is built once and then updated by every edit. Paragraphs
+        are stored by id (see ParagraphIds), so adding or deleting a
+        paragraph does not change the entries of the following paragraphs.
     
         Parameters
         ----------
@@ -218,29 +1152,209 @@ class Editor:
     
         Returns
         -------
-        None.
+        word_index : dict
+            key: term, value: list with the paragraph numbers of the term
     
         """
-        word_index = {}
-        alphabet = list(string.ascii_letters)
-        # make word index
-        counter_paragraph = 1
-        for paragraph in self.text:
-            split_paragraph = paragraph.split()  # get single words
-            for term in split_paragraph:
-                if term[0].isupper():  # term starts with a capital letter
-                    if term[-1] not in alphabet:
-                        # cuts last character if it is a symbol/punctuation
-                        term = term[:-1]
-                    if term not in word_index:
-                        word_index[term] = [counter_paragraph]
-                    else:
-                        if counter_paragraph in word_index[term]:
-                            None
-                        else:
-                            word_index[term].append(counter_paragraph)
-            counter_paragraph += 1
-        return word_index
+        with self.build_lock:
+            if self.term_index is None:  # first call, build the index
+                term_index = TermIndex(self.capital_terms)
+                for paragraph_id, paragraph in zip(self.get_paragraph_ids(),
+                                                   self.text):
+                    term_index.add(paragraph_id, paragraph)
+                self.term_index = term_index
+                # set when complete, a concurrent reader never sees a
+                # partial index
+            if self.word_index is None:  # text was changed since last call
+                paragraph_ids = self.paragraph_ids
+                position_of = paragraph_ids.position_of
+                if self.term_index.posting_count() > len(paragraph_ids) // 8:
+                    position_of = paragraph_ids.positions().get
+                self.word_index = self.term_index.word_index(position_of)
+            return self.word_index
+
+    def precompute(self, index=False, step_size=256):
+        """
+        Computes the text in the current format and, if index is True, the
+        word index, in steps of step_size paragraphs, e.g. in a background
+        thread between two commands (see BackgroundWorker). Only paragraphs
+        that are not in the caches are formatted and indexed, and a result
+        is only set when it is complete. The text must not change while the
+        generator is suspended: the caller compares version after every
+        step and drops the generator when the text was changed.
+
+        Parameters
+        ----------
+        index : bool
+            also compute the result of index()
+        step_size : int
+            number of paragraphs per step
+
+        Returns
+        -------
+        steps : generator
+            yields None after every step
+
+        """
+        count = len(self.text)
+        if count and not self.text_in_format_is_valid:
+            lines = []
+            for start in range(0, count, step_size):
+                paragraphs = self.text.iter_range(start, start + step_size)
+                if self.current_format[0] == "raw":
+                    lines.extend(self.iter_format_raw(paragraphs, start + 1))
+                else:
+                    lines.extend(self.iter_format_fix(paragraphs))
+                yield
+            with self.build_lock:
+                self.text_in_format = lines
+                self.text_in_format_is_valid = True
+        if not index:
+            return
+        if self.term_index is None:
+            paragraph_ids = iter(self.get_paragraph_ids())
+            yield
+            term_index = TermIndex(self.capital_terms)
+            for start in range(0, count, step_size):
+                for paragraph, paragraph_id in zip(
+                        self.text.iter_range(start, start + step_size),
+                        paragraph_ids):
+                    # paragraphs first, zip must not take an id that
+                    # belongs to the next step
+                    term_index.add(paragraph_id, paragraph)
+                yield
+            with self.build_lock:
+                if self.term_index is None:  # index() did not run meanwhile
+                    self.term_index = term_index
+        self.index()
+
+    def memory_usage(self):
+        """
+        Estimates the memory of the text and its UNDO/REDO history, e.g. to
+        decide which documents a workspace moves to disk (see Workspace).
+        Formatted paragraphs and indexes are not counted, they are built
+        again when needed.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        memory : int
+            bytes
+
+        """
+        memory = (self.pool.unique_bytes + 8 * self.get_paragraph_count()
+                  + self.history_memory)
+        if hasattr(self.text, "cache_stats"):
+            memory += self.text.cache_stats()["compressed_bytes"]
+        return memory
+
+    def memory_report(self):
+        """
+        Returns how much memory the shared paragraphs save (see
+        ParagraphPool). The paragraphs of a loaded file or a compressed
+        store are not in the pool and not counted.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        report : dict
+            paragraphs: number of paragraphs in the text,
+            unique: number of different paragraphs in the pool,
+            bytes: memory of the shared paragraphs,
+            bytes_without_sharing: memory of one string per paragraph,
+            saved_bytes: difference of the two,
+            format_cache: number of paragraphs in format_fix_cache,
+            format_widths: column widths with formatted lines in the cache,
+            token_cache: number of paragraphs in token_cache,
+            store: hit and miss counters of a compressed store (see
+            CompressedParagraphStore.cache_stats), only for such a store
+
+        """
+        report = {"paragraphs": self.get_paragraph_count(),
+                  "unique": len(self.pool),
+                  "bytes": self.pool.unique_bytes,
+                  "bytes_without_sharing": self.pool.referenced_bytes,
+                  "saved_bytes": (self.pool.referenced_bytes
+                                  - self.pool.unique_bytes),
+                  "format_cache": len(self.format_fix_cache),
+                  "format_widths": list(self.format_fix_caches),
+                  "token_cache": len(self.token_cache)}
+        if hasattr(self.text, "cache_stats"):
+            report["store"] = self.text.cache_stats()
+        return report
+
+    def get_paragraph_ids(self):
+        """
+        Returns the ids of the paragraphs (see ParagraphIds), they are
+        created on the first call.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        paragraph_ids : ParagraphIds
+
+        """
+        with self.build_lock:
+            if self.paragraph_ids is None:
+                self.paragraph_ids = ParagraphIds(len(self.text))
+            return self.paragraph_ids
+
+    def find(self, search):
+        """
+        Finds all paragraphs that contain a text. The trigram index (see
+        TrigramIndex) narrows the search down to a few candidates, which are
+        checked against the text. The index is built on the first call and
+        then updated by every edit. Searches for less than three characters,
+        or for a text that most paragraphs contain, read the whole text
+        instead.
+
+        Parameters
+        ----------
+        search : str
+
+        Returns
+        -------
+        hits : list
+            tuples (paragraph number, offsets) sorted by number, offsets is
+            a list with the 0-based positions of the text in the paragraph
+
+        """
+        if not search:
+            return []
+        paragraph_ids = None
+        if len(search) >= 3:
+            with self.build_lock:
+                trigram_index = self.trigram_index
+                if trigram_index is None or trigram_index.is_outdated():
+                    trigram_index = TrigramIndex(
+                        None if self.cache_paragraphs else self.paragraph_of)
+                    for paragraph_id, paragraph in zip(
+                            self.get_paragraph_ids(), self.text):
+                        trigram_index.add(paragraph_id, paragraph)
+                    self.trigram_index = trigram_index  # set when complete
+            paragraph_ids = trigram_index.find(
+                search, len(self.paragraph_ids) // 4)
+        if paragraph_ids is None:  # check every paragraph
+            return [(number, _offsets(paragraph, search))
+                    for number, paragraph in enumerate(self.text, 1)
+                    if search in paragraph]
+        position_of = self.paragraph_ids.position_of
+        return sorted((position_of(paragraph_id) + 1,
+                       _offsets(trigram_index.paragraph(paragraph_id), search))
+                      for paragraph_id in paragraph_ids)
+
+    def paragraph_of(self, paragraph_id):
+        # paragraph with an id (see ParagraphIds), read from the text
+        return self.text[self.paragraph_ids.position_of(paragraph_id)]
 
     def get_text_in_format(self):
         """
@@ -257,12 +1371,255 @@ class Editor:
 
         """
         if len(self.text) <= 0:
-            return self.text
+            return []
+        with self.build_lock:
+            if self.text_in_format_is_valid:  # nothing changed since then
+                return self.text_in_format
+            if self.current_format[0] == "raw":
+                self.format_raw()
+            else:
+                self.format_fix()
+            self.text_in_format_is_valid = True
+            return self.text_in_format
+
+    def iter_text_in_format(self, first=1, last=None):
+        """
+        Yields the lines of the paragraphs first to last according to the
+        currently set output format. Only these paragraphs are formatted and
+        no list of the whole text is built, so the first line is available
+        immediately.
+
+        Parameters
+        ----------
+        first : int
+            number of the first paragraph
+        last : int
+            number of the last paragraph, None for the last of the text
+
+        Returns
+        -------
+        lines : generator
+
+        """
+        count = len(self.text)
+        last = count if last is None else min(last, count)
+        if first == 1 and last == count and self.text_in_format_is_valid:
+            yield from self.text_in_format
+            return
+        paragraphs = self.text.iter_range(first - 1, last)
+        if self.current_format[0] == "raw":
+            yield from self.iter_format_raw(paragraphs, first)
+        else:
+            yield from self.iter_format_fix(paragraphs, last - first + 1)
+
+    def line_count(self):
+        """
+        Returns the number of output lines of the text in the current
+        format. In format fix the lines are counted on the first call (see
+        get_line_counts).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        count : int
+
+        """
+        if self.current_format[0] == "raw":
+            return len(self.text)
+        return self.get_line_counts().total()
+
+    def find_line(self, line):
+        """
+        Returns the paragraph that contains an output line of the current
+        format in O(log n).
+
+        Parameters
+        ----------
+        line : int
+            number of the output line, the first line is 1
+
+        Returns
+        -------
+        (n, offset) : tuple
+            number of the paragraph and 0-based line within the paragraph
+
+        Raises
+        ------
+        IndexError
+            if the text has less lines
+
+        """
+        if self.current_format[0] == "raw":
+            if not 1 <= line <= len(self.text):
+                raise IndexError("line out of range")
+            return line, 0
+        index, offset = self.get_line_counts().paragraph_of(line - 1)
+        return index + 1, offset
+
+    def first_line_of(self, n):
+        """
+        Returns the number of the output line at which paragraph n starts
+        in the current format, e.g. to show a viewport around paragraph n.
+
+        Parameters
+        ----------
+        n : int
+            number of the paragraph
+
+        Returns
+        -------
+        line : int
+
+        """
         if self.current_format[0] == "raw":
-            self.format_raw()
+            return n
+        return self.get_line_counts().line_of(n - 1) + 1
+
+    def viewport(self, line, height):
+        """
+        Returns the output lines line to line+height-1 of the current format.
+        Only the paragraphs that intersect this window are formatted, the
+        first one is found by find_line.
+
+        Parameters
+        ----------
+        line : int
+            number of the first output line, the first line of the text is 1
+        height : int
+            maximum number of lines
+
+        Returns
+        -------
+        lines : list
+            less than height lines at the end of the text
+
+        """
+        line = max(line, 1)
+        if height <= 0 or line > self.line_count():
+            return []
+        if self.text_in_format_is_valid:
+            return self.text_in_format[line - 1:line - 1 + height]
+        n, offset = self.find_line(line)
+        # every paragraph has at least one line, so the window ends in
+        # paragraph n + height - 1 at the latest
+        lines = self.iter_text_in_format(n, n + height - 1)
+        return list(islice(lines, offset, offset + height))
+
+    def print_changes(self):
+        """
+        Returns how the output in the current format changed since the last
+        call, as a compact diff. Only the paragraphs that were edited since
+        then are formatted, and their lines are compared with the
+        fingerprints of the last output (see PrintedOutput); lines at the
+        start and at the end of an edited part that did not change are left
+        out. The whole text is compared after UNDO/REDO or a new text, and
+        every line is new after a change of the format. The first call
+        returns the whole text.
+        In format raw a paragraph is compared without its number, so the
+        paragraphs after an added or deleted one are not repeated.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        changes : list
+            tuples (old_line, old_count, new_line, new_count, first, last,
+            lines): the old_count lines from line old_line of the last output
+            were replaced by the new_count lines from line new_line, which
+            are in the paragraphs first to last (last is first - 1 if lines
+            were only removed). lines are the new lines
+
+        """
+        printed = self.printed
+        fingerprints = None  # of the whole text, if it is compared
+        if printed is None or printed.runs is None \
+                or printed.format != self.current_format:
+            fingerprints = [self.output_fingerprint(paragraph)
+                            for paragraph in self.text]
+            if self.line_counts is None and self.current_format[0] == "fix":
+                self.line_counts = LineCounts(len(fingerprint) // 8 for
+                                              fingerprint in fingerprints)
+                self.line_counts_width = self.format_fix_width
+        # every line is new after a change of the format or the width, even
+        # if it looks like a line of the last output
+        all_new = printed is None or printed.format != self.current_format
+        if all_new:
+            if printed is None:
+                printed = PrintedOutput(self.current_format, [])
+            ranges = [(0, len(printed.fingerprints), 0, len(fingerprints))]
         else:
-            self.format_fix()
-        return self.text_in_format
+            ranges = printed.changed_ranges(fingerprints)
+
+        changes = []
+        new_fingerprints = []
+        # fingerprints of the paragraphs of every range, if the whole text
+        # was not compared
+        shift = 0  # lines added minus lines removed by the changes before
+        for printed_first, printed_stop, first, stop in ranges:
+            lines = []
+            range_fingerprints = []
+            for number, paragraph in enumerate(
+                    self.text.iter_range(first, stop), first + 1):
+                paragraph_lines = self.output_lines(paragraph, number)
+                lines.extend(paragraph_lines)
+                if fingerprints is None:
+                    range_fingerprints.append(self.output_fingerprint(
+                        paragraph, paragraph_lines))
+            if fingerprints is None:
+                new_fingerprints.append(range_fingerprints)
+            else:
+                range_fingerprints = fingerprints[first:stop]
+            old = line_hashes(printed.fingerprints[printed_first:
+                                                   printed_stop])
+            new = line_hashes(range_fingerprints)
+            head = 0
+            shorter = 0 if all_new else min(len(old), len(new))
+            while head < shorter and old[head] == new[head]:
+                head += 1
+            tail = 0
+            while tail < shorter - head and old[-1 - tail] == new[-1 - tail]:
+                tail += 1
+            old_count = len(old) - head - tail
+            new_count = len(new) - head - tail
+            if old_count or new_count:
+                new_line = self.first_line_of(first + 1) + head
+                changes.append((new_line - shift, old_count, new_line,
+                                new_count, first + 1, stop,
+                                lines[head:head + new_count]))
+            shift += len(new) - len(old)
+
+        if fingerprints is None:  # the printed ones with the edited ones
+            fingerprints = []
+            printed_position = 0
+            for (printed_first, printed_stop, _, _), range_fingerprints \
+                    in zip(ranges, new_fingerprints):
+                fingerprints += printed.fingerprints[printed_position:
+                                                     printed_first]
+                fingerprints += range_fingerprints
+                printed_position = printed_stop
+            fingerprints += printed.fingerprints[printed_position:]
+        self.printed = PrintedOutput(self.current_format, fingerprints)
+        return changes
+
+    def output_lines(self, paragraph, number):
+        # lines of paragraph number in the current format
+        if self.current_format[0] == "raw":
+            return (str(number) + " : " + paragraph,)
+        return self.format_fix_lines(paragraph)
+
+    def output_fingerprint(self, paragraph, lines=None):
+        # fingerprint of the lines of a paragraph for print_changes, in
+        # format raw without the paragraph number
+        if self.current_format[0] == "raw":
+            return fingerprint((paragraph,))
+        if lines is None:
+            lines = self.format_fix_lines(paragraph)
+        return fingerprint(lines)
 
     def replace(self, search, replace, n):
         """
@@ -286,9 +1643,57 @@ class Editor:
         None.
     
         """
+        self.remember(self.text[n-1])
         paragraph = self.text.pop(n-1)
-        new_paragraph = paragraph.replace(search, replace)
+        new_paragraph = self.pool.intern(paragraph.replace(search, replace))
+        self.paragraph_removed(n-1, paragraph)
         self.text.insert(n-1, new_paragraph)
+        self.paragraph_added(n-1, new_paragraph)
+        self.notify("replace", search, replace, n)
+
+    def replace_all(self, mapping, first=1, last=None):
+        """
+        Method replaces several words or texts at once in the paragraphs
+        first to last. All search strings are found in one pass over every
+        paragraph (see AhoCorasick): from left to right, and the longest
+        search string wins where several start at the same position.
+        Changed paragraphs are replaced in place.
+
+        Parameters
+        ----------
+        mapping : dict
+            key: "Old" string, value: "New" string
+        first : int
+            number of the first paragraph
+        last : int
+            number of the last paragraph, None for the end of the text
+
+        Returns
+        -------
+        count : int
+            number of replacements
+
+        """
+        automaton = Automaton(mapping)
+        changes = []
+        count = 0
+        for index, paragraph in enumerate(
+                self.text.iter_range(first - 1, last), first - 1):
+            new_paragraph, replacements = substitute(paragraph, mapping,
+                                                     automaton)
+            if replacements:
+                changes.append((index, paragraph, new_paragraph))
+                count += replacements
+        if changes:
+            snapshot = self.text.snapshot()
+            for index, paragraph, new_paragraph in changes:
+                new_paragraph = self.pool.intern(new_paragraph)
+                self.text[index] = new_paragraph
+                self.paragraph_changed(index, paragraph, new_paragraph)
+            self.remember(*(paragraph for _, paragraph, _ in changes),
+                          snapshot=snapshot, edits=len(changes))
+            self.notify("replace_all", mapping, first, last)
+        return count
 
 
 if __name__ == "__main__":
@@ -349,3 +1754,79 @@ if __name__ == "__main__":
     editor.replace("suche dich", "habe dich gefunden", False)
     editor.replace("k", "K", 2)
 
+
+    print("\nTest: Format cache")
+    editor.change_format("fix", 20)
+    print(editor.get_text_in_format() is editor.get_text_in_format())
+    # expected output: True, the formatted text is reused
+
+    print("\nTest: Replace all")
+    print(editor.replace_all({"Hund": "Katze", "Katze": "Hund"}))
+    # expected output: the number of replacements
+
+    print("\nTest: Find")
+    print(editor.find("ipsum"))  # expected output: [(9, [6])], the dummy
+
+    print("\nTest: Memory report")
+    editor.dummy_n(1)
+    print(editor.memory_report()["saved_bytes"] > 0)
+    # expected output: True, the two dummies share one string
+
+    print("\nTest: Viewport")
+    editor.change_format("fix", 20)
+    line = editor.first_line_of(3)
+    print(editor.find_line(line), editor.viewport(line, 2)
+          == editor.get_text_in_format()[line - 1:line + 1])
+    # expected output: (3, 0) True
+
+    print("\nTest: Print changes after a format change")
+    changes_editor = Editor()
+    changes_editor.add_n("abc def", 1)
+    changes_editor.add_n("ghi", 2)
+    changes_editor.print_changes()
+    changes_editor.change_format("fix", 20)
+    print(changes_editor.print_changes())
+    # expected output: [(1, 2, 1, 2, 1, 2, ['abc def\n', 'ghi\n'])]
+    changes_editor.change_format("fix", 4)
+    print([change[:4] for change in changes_editor.print_changes()])
+    # expected output: [(1, 2, 1, 3, ...)], every line is new
+
+    print("\nTest: Undo/Redo")
+    before = list(editor.text)
+    editor.del_n(1)
+    editor.dummy_n(1)
+    editor.undo()
+    editor.undo()
+    print(list(editor.text) == before)  # expected output: True
+    editor.redo()
+    print(editor.get_paragraph_count() == len(before) - 1)
+    # expected output: True
+
+    print("\nTest: Pool after Undo")
+    pool_editor = Editor()
+    pool_editor.change_format("fix", 10)
+    pool_editor.add_n("Hund und Katze", 1)
+    pool_editor.add_n("Hund und Katze", 1)
+    pool_editor.undo()  # one paragraph left, the pool counted two
+    pool_editor.del_n(1)
+    print(pool_editor.get_text_in_format(), len(pool_editor.pool),
+          len(pool_editor.format_fix_cache))
+    # expected output: [] 0 0
+
+    print("\nTest: Memory of a compressed text")
+    import tracemalloc
+    from ParagraphStore import CompressedParagraphStore
+    paragraphs = ["Hund " + "und katze " * 400 + str(number)
+                  for number in range(500)]
+    text_size = sum(map(sys.getsizeof, paragraphs))
+    tracemalloc.start()
+    compressed_editor = Editor(CompressedParagraphStore(
+        paragraphs, block_size=16, hot_blocks=2))
+    compressed_editor.change_format("fix", 40)
+    for line in compressed_editor.iter_text_in_format():
+        pass  # PRINT
+    compressed_editor.index()
+    compressed_editor.find("katze 7")
+    print(tracemalloc.get_traced_memory()[0] < text_size / 4)
+    # expected output: True, only the hot blocks are kept as strings
+    tracemalloc.stop()
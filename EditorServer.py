@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Editor Server """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import asyncio
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+
+from Editor import Editor
+from EditorUI import EditorUI
+
+
+# Protocol: the client sends the lines of a script, exactly as in batch mode
+# (see EditorUI.run_batch), and may send many of them without waiting for
+# the answers. For every command the server answers with a line
+# '#<number of lines>' followed by the output lines of the command. The
+# command 'USE <name>' selects the document of the connection, a new
+# document is created empty; a connection starts with the document
+# DEFAULT_DOCUMENT. EXIT or the end of the input closes the connection.
+
+DEFAULT_DOCUMENT = "default"
+LINE_LIMIT = 2**24
+# longest line in bytes that is read from a connection
+
+
+def parse_address(address):
+    """
+    Splits the address of a server into host and port. An address that
+    does not end in ':<port>' is the path of a Unix socket.
+
+    Parameters
+    ----------
+    address : str
+        e.g. 'localhost:7000' or '/tmp/editor.sock'
+
+    Returns
+    -------
+    (host, port) : tuple
+        host is the path and port None for a Unix socket
+
+    """
+    host, _, port = address.rpartition(":")
+    if host and port.isnumeric():
+        return host, int(port)
+    return address, None
+
+
+class ThreadOutput:
+
+    def __init__(self, stream):
+        # replaces sys.stdout: print() in a thread that captures its output
+        # writes to the stream of this thread, every other thread to stream.
+        # redirect_stdout cannot be used because it changes the output of
+        # all threads
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, "stream", self.stream).write(text)
+
+    def flush(self):
+        getattr(self.local, "stream", self.stream).flush()
+
+    @contextmanager
+    def capture(self, stream):
+        """
+        Writes the output of the current thread in the with block to stream.
+
+        Parameters
+        ----------
+        stream : file
+
+        Returns
+        -------
+        context manager
+
+        """
+        self.local.stream = stream
+        try:
+            yield
+        finally:
+            del self.local.stream
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class ReadWriteLock:
+
+    def __init__(self):
+        # Any number of readers or one writer. A waiting writer stops new
+        # readers, so that a stream of reads cannot delay an edit forever
+        self.condition = asyncio.Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    @asynccontextmanager
+    async def read_locked(self):
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: not self.writing and not self.waiting_writers)
+            self.readers += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.readers -= 1
+                self.condition.notify_all()
+
+    @asynccontextmanager
+    async def write_locked(self):
+        async with self.condition:
+            self.waiting_writers += 1
+            try:
+                await self.condition.wait_for(
+                    lambda: not self.writing and not self.readers)
+            finally:
+                self.waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+class Document:
+
+    def __init__(self, name, editor):
+        self.name = name
+        self.editor = editor
+        self.lock = ReadWriteLock()
+        # commands that change the text run one after the other, commands
+        # that only read it (see Editor.commands_reading_text) together
+
+
+class EditorServer:
+
+    def __init__(self, editor_factory=Editor, workers=4):
+        self.editor_factory = editor_factory
+        # creates the editor of a new document, e.g. with the settings of
+        # the command line
+        self.documents = {}
+        # key: name, value: Document
+        self.executor = ThreadPoolExecutor(workers)
+        # the commands run in these threads, so that a long command does
+        # not stop the connections of other documents
+        self.output = None  # ThreadOutput, set by serve()
+
+    def get_document(self, name):
+        """
+        Returns the document with the name, a new document is created.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        document : Document
+
+        """
+        if name not in self.documents:
+            self.documents[name] = Document(name, self.editor_factory())
+        return self.documents[name]
+
+    async def serve(self, address, started=None):
+        """
+        Accepts connections until the task is cancelled. Meanwhile
+        sys.stdout is a ThreadOutput, so the output of every command goes to
+        its connection; the old sys.stdout is restored at the end.
+
+        Parameters
+        ----------
+        address : str
+            'host:port' or path of a Unix socket (see parse_address)
+        started : asyncio.Event
+            set as soon as connections are accepted
+
+        Returns
+        -------
+        None.
+
+        """
+        stdout = sys.stdout
+        if not isinstance(stdout, ThreadOutput):
+            sys.stdout = ThreadOutput(stdout)
+        self.output = sys.stdout
+        try:
+            host, port = parse_address(address)
+            if port is None:
+                server = await asyncio.start_unix_server(
+                    self.handle_connection, host, limit=LINE_LIMIT)
+            else:
+                server = await asyncio.start_server(
+                    self.handle_connection, host, port, limit=LINE_LIMIT)
+            async with server:
+                if started is not None:
+                    started.set()
+                await server.serve_forever()
+        finally:
+            if sys.stdout is self.output:  # not replaced by someone else
+                sys.stdout = stdout
+
+    def close(self):
+        """
+        Closes the editors of all documents.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.executor.shutdown()
+        for document in self.documents.values():
+            document.editor.close()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Runs the commands of a connection in the order they arrive and sends
+        the answers back.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+        writer : asyncio.StreamWriter
+
+        Returns
+        -------
+        None.
+
+        """
+        document = self.get_document(DEFAULT_DOCUMENT)
+        session = EditorUI(editor=document.editor)
+        session.start()
+        pending = []  # lines that were received but not used yet
+        try:
+            while session.running:
+                if not pending:
+                    line = await self.read_line(reader)
+                    if line is None:
+                        break
+                    pending.append(line)
+                if pending[0].upper().startswith("USE "):
+                    document = self.get_document(pending.pop(0)[4:].strip())
+                    session = EditorUI(editor=document.editor)
+                    session.start()
+                    output = "Using document " + document.name + "\n"
+                else:
+                    answer = await self.run_command(document, session,
+                                                    pending, reader)
+                    if answer is None:  # input ended within the command
+                        break
+                    output, used = answer
+                    del pending[:used]
+                lines = output.split("\n")[:-1] if output else []
+                writer.write(("#" + str(len(lines)) + "\n" + output)
+                             .encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def run_command(self, document, session, pending, reader):
+        """
+        Runs the command pending[0] under the lock of the document. Commands
+        read their input before they change the text, so a command that
+        needs more lines than were received is stopped and run again as
+        soon as the next line arrives; the lock is not held meanwhile.
+
+        Parameters
+        ----------
+        document : Document
+        session : EditorUI
+            the EditorUI of the connection
+        pending : list
+            received lines, starting with the command. Lines that arrive
+            while waiting are appended
+        reader : asyncio.StreamReader
+
+        Returns
+        -------
+        (output, used) : tuple
+            output of the command and the number of lines it used, None if
+            the connection ended before the command was complete
+
+        """
+        command = session.split_command(pending[0])[0]
+        if command in document.editor.commands_reading_text:
+            locked = document.lock.read_locked
+        else:
+            locked = document.lock.write_locked
+        loop = asyncio.get_running_loop()
+        while True:
+            async with locked():
+                answer = await loop.run_in_executor(
+                    self.executor, self.execute, session, list(pending))
+            if answer is not None:
+                return answer
+            line = await self.read_line(reader)
+            if line is None:
+                return None
+            pending.append(line)
+
+    def execute(self, session, lines):
+        """
+        Runs a command with its input lines in a thread of the executor.
+
+        Parameters
+        ----------
+        session : EditorUI
+        lines : list
+            the command and the lines after it
+
+        Returns
+        -------
+        (output, used) : tuple
+            None if the command needs more lines
+
+        """
+        buffer = io.StringIO()
+        script = iter(lines)
+        session.script = script
+        try:
+            with self.output.capture(buffer):
+                try:
+                    session.execute_command(next(script))
+                except EOFError:
+                    return None
+                except Exception as error:
+                    # the server keeps running, the client gets the error
+                    print("Error:", error)
+        finally:
+            session.script = None
+        return buffer.getvalue(), len(lines) - sum(1 for _ in script)
+
+    @staticmethod
+    async def read_line(reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        return line.decode("utf-8").rstrip("\r\n")
+
+
+async def send_script(address, script, output):
+    """
+    Sends the lines of a script to a server and writes the output of the
+    commands. The lines are sent while the answers are read, so the whole
+    script costs about one round trip.
+
+    Parameters
+    ----------
+    address : str
+        'host:port' or path of a Unix socket (see parse_address)
+    script : iterable
+        lines of the script, e.g. an open file
+    output : file
+
+    Returns
+    -------
+    None.
+
+    """
+    host, port = parse_address(address)
+    if port is None:
+        reader, writer = await asyncio.open_unix_connection(
+            host, limit=LINE_LIMIT)
+    else:
+        reader, writer = await asyncio.open_connection(host, port,
+                                                       limit=LINE_LIMIT)
+
+    async def send():
+        for number, line in enumerate(script, 1):
+            writer.write((line.rstrip("\r\n") + "\n").encode("utf-8"))
+            if number % 1024 == 0:
+                await writer.drain()
+        await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+
+    sending = asyncio.create_task(send())
+    try:
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            for _ in range(int(header[1:])):
+                output.write((await reader.readline()).decode("utf-8"))
+    finally:
+        sending.cancel()
+        writer.close()
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("\nTest: parse_address")
+    print(parse_address("localhost:7000"), parse_address("/tmp/editor.sock"))
+    # expected output: ('localhost', 7000) ('/tmp/editor.sock', None)
+
+    async def test():
+        server = EditorServer()
+        path = os.path.join(tempfile.mkdtemp(), "editor.sock")
+        started = asyncio.Event()
+        serving = asyncio.create_task(server.serve(path, started))
+        await started.wait()
+
+        print("\nTest: send_script")
+        output = io.StringIO()
+        await send_script(path, ["ADD", "Hund und Katze", "ADD 1",
+                                 "Maus", "PRINT"], output)
+        print(output.getvalue(), end="")
+        # expected output: Successfully added paragraph (2x), Maus,
+        # Hund und Katze
+
+        print("\nTest: shared document, concurrent clients")
+        outputs = [io.StringIO() for _ in range(3)]
+        await asyncio.gather(*(send_script(path, ["ADD", "Absatz"] * 100,
+                                           output) for output in outputs))
+        output = io.StringIO()
+        await send_script(path, ["USE other", "PRINT", "USE default",
+                                 "FIND Absatz"], output)
+        lines = output.getvalue().split("\n")
+        print(lines[:3], lines[-2])
+        # expected output: ['Using document other', 'Your editor does not
+        # have any text in it yet...', 'Using document default'] Found 300
+        # occurrences in 300 paragraphs
+
+        print("\nTest: read commands at the same time")
+        script = ["ADD 1-100"] + [
+            "Katze Nr. " + str(number) for number in range(100)] + [
+            "FORMAT FIX 30"]
+        await send_script(path, ["USE cats"] + script, io.StringIO())
+        outputs = [io.StringIO() for _ in range(8)]
+        await asyncio.gather(*(send_script(path, ["USE cats", "PRINT",
+                                                  "INDEX", "FIND Nr. 5"],
+                                           output) for output in outputs))
+        print(len({output.getvalue() for output in outputs}))
+        # expected output: 1, every client got the same answers
+
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        server.close()
+
+    asyncio.run(test())
+    print("\nTest: sys.stdout after the server")
+    print(isinstance(sys.stdout, ThreadOutput))  # expected output: False
@@ -11,23 +11,89 @@ __email__      = 'xaajisal@students.zhaw.ch'
 __status__     = 'done'
 
 
-from Editor import Editor
+import cProfile
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext, redirect_stdout
+
+from BackgroundWorker import BackgroundWorker
+from CommandStats import INVALID_COMMAND, CommandStats, TimedOutput
 from EditorValidator import Validator
+from Workspace import Workspace
+
+
+@contextmanager
+def profiled(path):
+    """
+    Profiles the code in the with block with cProfile and writes the profile
+    to path when the block ends. Does nothing if path is empty.
+
+    Parameters
+    ----------
+    path : str
+
+    Returns
+    -------
+    context manager
+
+    """
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
 
 
 class EditorUI:
 
-    def __init__(self):
+    def __init__(self, stats=False, editor=None, workspace=None,
+                 background=False):
         self.running = False
-        self.editor = Editor()
+        self.script = None
+        # iterator over the lines of a script in batch mode, else None
+        self.stats = CommandStats() if stats else None
+        # time of every phase of every command, None if not recorded
+        self.profile_path = os.environ.get("EDITOR_PROFILE")
+        # the session is profiled and the profile is written to this file on
+        # EXIT, e.g. EDITOR_PROFILE=editor.prof (see pstats)
+        self.print_block_size = 4096
+        # number of lines that PRINT writes to the output at once
+        self.background = BackgroundWorker() if background else None
+        # formats the text after every change while run() waits for the
+        # next command, None if not used
+        self.index_used = False
+        # True after the first INDEX, from then on the background worker
+        # also updates the index
+        if editor is None:
+            self.workspace = Workspace() if workspace is None else workspace
+            editor = self.workspace.current.editor
+        else:
+            self.workspace = None
+            # several EditorUI can share one editor, e.g. the connections
+            # of an EditorServer; there is only this document then
+        self.editor = editor  # editor of the current document
         self.validator = Validator(self.editor.commands,
                                    self.editor.commands_with_parameter,
-                                   self.editor.commands_adding_text)
+                                   self.editor.commands_adding_text,
+                                   self.editor.commands_with_argument)
         self.commands_map = {
-            "ADD": self.add, "DEL": self.delete,
-            "DUMMY": self.dummy, "FORMAT RAW": self.change_format_to_raw,
+            "ADD": self.add, "CLOSE": self.close, "DEL": self.delete,
+            "DUMMY": self.dummy, "FIND": self.find,
+            "FORMAT RAW": self.change_format_to_raw,
             "FORMAT FIX": self.change_format_to_fix, "INDEX": self.index,
-            "PRINT": self.print_text, "REPLACE": self.replace,
+            "LOAD": self.load, "MEMORY": self.memory,
+            "OPEN": self.open, "PRINT": self.print_text,
+            "PRINT CHANGES": self.print_changes,
+            "REDO": self.redo, "REPLACE": self.replace,
+            "REPLACE ALL": self.replace_all, "SAVE": self.save,
+            "STATS": self.print_stats, "SWITCH": self.switch,
+            "UNDO": self.undo,
             "EXIT": self.exit}
         # dictionary of all the editor commands
         # keys: name of the commands in the class 'Editor'
@@ -36,7 +102,8 @@ class EditorUI:
     def run(self):
         """
         Method runs the editor. To quit the method the function exit() must be
-        called.
+        called. With a background worker the text is formatted (and indexed)
+        after every change while the next command is typed.
         
         Parameters
         ----------
@@ -48,23 +115,203 @@ class EditorUI:
         
         """
         self.start()
-        while self.running:
-            user_command = self.get_user_command()
-            
-            formatted_command = self.split_command(user_command)
+        with profiled(self.profile_path):
+            while self.running:
+                user_command = self.get_user_command()
+                if self.background is None:
+                    self.execute_command(user_command)
+                    continue
+                with self.background.paused():
+                    editor, version = self.editor, self.editor.version
+                    self.execute_command(user_command)
+                    if self.editor is not editor \
+                            or self.editor.version != version:
+                        # the text changed, the old results are outdated
+                        self.background.schedule(self.editor,
+                                                 self.index_used)
+        if self.background is not None:
+            self.background.close()
+
+    def run_batch(self, script, output=None):
+        """
+        Method runs the commands of a script without printing the menu or
+        the prompts. The script contains the same lines a user would type:
+        a command per line, followed by the paragraph for ADD or the search
+        and replace text for REPLACE. The method stops at EXIT or at the end
+        of the script.
+
+        Parameters
+        ----------
+        script : iterable
+            lines of the script, e.g. an open file
+        output : file
+            stream for the output, should be buffered. Default is sys.stdout
+
+        Returns
+        -------
+        None.
+
+        """
+        self.script = (line.rstrip("\r\n") for line in script)
+        try:
+            with redirect_stdout(output) if output else nullcontext(), \
+                    profiled(self.profile_path):
+                self.start()
+                for user_command in self.script:
+                    self.execute_command(user_command)
+                    if not self.running:
+                        break
+        except EOFError:  # script ended in the middle of a command
+            pass
+        finally:
+            self.script = None
+            self.running = False
+
+    def execute_command(self, user_command):
+        """
+        Method splits and validates a command and runs it
+    
+        Parameters
+        ----------
+        user_command : str
+            The raw command, e.g. 'ADD 3'
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.stats is not None:
+            self.execute_command_timed(user_command)
+            return
+        formatted_command = self.split_command(user_command)
 
+        validated_input = self.validator.input_is_valid(
+                                formatted_command,
+                                self.editor.get_paragraph_count()
+                            )
+        if not validated_input[0]:
+            print(validated_input[1])
+            self.skip_input(formatted_command)
+
+        else:
+            self.call_command(formatted_command)
+
+    def execute_command_timed(self, user_command):
+        """
+        Method runs a command like execute_command and records the time of
+        every phase in self.stats. Input that is not a command is recorded
+        as INVALID_COMMAND
+    
+        Parameters
+        ----------
+        user_command : str
+            The raw command, e.g. 'ADD 3'
+
+        Returns
+        -------
+        None.
+    
+        """
+        output = TimedOutput(sys.stdout)
+        with redirect_stdout(output):
+            start = time.perf_counter()
+            formatted_command = self.split_command(user_command)
+            split = time.perf_counter()
             validated_input = self.validator.input_is_valid(
-                                    formatted_command,len(self.editor.text)
+                                    formatted_command,
+                                    self.editor.get_paragraph_count()
                                 )
+            validated = time.perf_counter()
             if not validated_input[0]:
                 print(validated_input[1])
-
+                self.skip_input(formatted_command)
             else:
-                command, parameter = formatted_command
-                if parameter and command in self.editor.commands_with_parameter:
-                    self.commands_map[command](parameter)
-                else:                    
-                    self.commands_map[command]()
+                self.call_command(formatted_command)
+            end = time.perf_counter()
+        command = formatted_command[0]
+        if command not in self.editor.commands:
+            command = INVALID_COMMAND  # one row for all of them
+        self.stats.record(command, "split", split - start)
+        self.stats.record(command, "validate", validated - split)
+        self.stats.record(command, "run", end - validated - output.elapsed)
+        self.stats.record(command, "output", output.elapsed)
+
+    def call_command(self, formatted_command):
+        """
+        Method calls the method of a validated command
+    
+        Parameters
+        ----------
+        formatted_command : tuple
+            command and parameter (see split_command)
+
+        Returns
+        -------
+        None.
+    
+        """
+        command, parameter = formatted_command
+        if parameter and (
+                command in self.editor.commands_with_parameter
+                or command in self.editor.commands_with_argument
+                or command in self.editor.commands_with_optional_argument):
+            self.commands_map[command](parameter)
+        else:
+            self.commands_map[command]()
+
+    def skip_input(self, formatted_command):
+        """
+        Method reads the lines that belong to a rejected command in batch
+        mode, so they are not run as commands: the paragraphs of ADD, the
+        search and replace text of REPLACE and the pairs of REPLACE ALL
+    
+        Parameters
+        ----------
+        formatted_command : tuple
+            command and parameter (see split_command)
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.script is None:
+            return
+        command, parameter = formatted_command
+        if command == "ADD":
+            count = 1
+            if isinstance(parameter, tuple):
+                count = parameter[1] - parameter[0] + 1
+            for _ in range(count):
+                self.read_input("Add Paragraph: ")
+        elif command == "REPLACE":
+            self.read_input("What do you want to replace: ")
+            self.read_input("With what do you want to replace it: ")
+        elif command == "REPLACE ALL":
+            while self.read_input(
+                    "What do you want to replace (empty to finish): "):
+                self.read_input("With what do you want to replace it: ")
+
+    def read_input(self, prompt):
+        """
+        Method reads a line from the user, or from the script in batch mode
+    
+        Parameters
+        ----------
+        prompt : str
+            text that is shown to the user
+
+        Returns
+        -------
+        line : str
+    
+        """
+        if self.script is None:
+            return input(prompt)
+        for line in self.script:
+            return line
+        raise EOFError("script ended before the input: " + prompt)
 
     def get_user_command(self):
         """
@@ -88,19 +335,25 @@ class EditorUI:
 
     def dummy(self, parameter= False):
         """
-        Method calls the dummy_n method from Editor and prints a message for the 
-        user
+        Method calls the dummy_n method from Editor, or dummy_many for a
+        range, and prints a message for the user
     
         Parameters
         ----------
-         parameter : bool / int
-            False if no parameter is given, else index of paragraph
+         parameter : bool / int / tuple
+            False if no parameter is given, else index of paragraph, or
+            (n, m) for dummies that become the paragraphs n to m
 
         Returns
         -------
         None.
     
         """
+        if isinstance(parameter, tuple):
+            first, last = parameter
+            self.editor.dummy_many(first, last - first + 1)
+            print("Successfully added", last - first + 1, "dummies")
+            return
         if parameter == False:
             parameter = self.define_n(add = True)
         self.editor.dummy_n(parameter)
@@ -109,23 +362,33 @@ class EditorUI:
     def add(self, parameter= False):
         """
         Method calls the add_n method from Editor and prints a message for the 
-        user
+        user. For a range, one paragraph per line is read and all of them
+        are added with add_many
     
         Parameters
         ----------
-        parameter : bool / int
-            False if no parameter is given, else index of paragraph
+        parameter : bool / int / tuple
+            False if no parameter is given, else index of paragraph, or
+            (n, m) for new paragraphs that become the paragraphs n to m
 
         Returns
         -------
         None.
     
         """
+        if isinstance(parameter, tuple):
+            first, last = parameter
+            new_paragraphs = [self.read_input("Add Paragraph: ")
+                              for _ in range(last - first + 1)]
+            self.editor.add_many(self.validator.validate_many(new_paragraphs),
+                                 first)
+            print("Successfully added", len(new_paragraphs), "paragraphs")
+            return
         # define parameter if not given
         if parameter == False:
             parameter = self.define_n(add = True)
         # user input
-        new_paragraph = str(input("Add Paragraph: "))
+        new_paragraph = self.read_input("Add Paragraph: ")
         # validate input
         validated_paragraph = \
             self.validator.validate_new_paragraph(new_paragraph)
@@ -134,13 +397,14 @@ class EditorUI:
 
     def delete(self, parameter= False):
         """
-        Method calls the del_n method from Editor and prints a message for the 
-        user
+        Method calls the del_n method from Editor, or del_range for a range,
+        and prints a message for the user
     
         Parameters
         ----------
-        parameter : bool / int
-            False if no parameter is given, else index of paragraph
+        parameter : bool / int / tuple
+            False if no parameter is given, else index of paragraph, or
+            (n, m) for the paragraphs n to m
 
         Returns
         -------
@@ -148,7 +412,11 @@ class EditorUI:
     
         """
         # check if there is a text to be deleted
-        if self.validator.text_is_given(self.editor.text):
+        if isinstance(parameter, tuple):
+            first, last = parameter
+            self.editor.del_range(first, last)
+            print("Successfully deleted", last - first + 1, "paragraphs")
+        elif self.validator.text_is_given(self.editor.text):
             # define parameter if not given
             if parameter == False:
                 parameter = self.define_n(add = False)
@@ -174,11 +442,231 @@ class EditorUI:
         """
         if parameter == False:
             parameter = self.define_n(add = False)
-        search = str(input("What do you want to replace: "))
-        replace = str(input("With what do you want to replace it: "))
+        search = self.read_input("What do you want to replace: ")
+        replace = self.read_input("With what do you want to replace it: ")
         self.editor.replace(search, replace, parameter)
         print("Successfully replaced paragraph")
 
+    def replace_all(self, parameter=False):
+        """
+        Method gets search and replace pairs from the user until an empty
+        search text is entered, replaces all of them at once in the whole
+        text or in the paragraphs n to m and prints the number of
+        replacements
+    
+        Parameters
+        ----------
+        parameter : bool / int / tuple
+            False for the whole text, n for paragraph n or (n, m) for the
+            paragraphs n to m
+
+        Returns
+        -------
+        None.
+    
+        """
+        if parameter == False:
+            first, last = 1, None
+        elif isinstance(parameter, tuple):
+            first, last = parameter
+        else:
+            first, last = parameter, parameter
+        mapping = {}
+        while True:
+            search = self.read_input(
+                "What do you want to replace (empty to finish): ")
+            if not search:
+                break
+            mapping[search] = self.read_input(
+                "With what do you want to replace it: ")
+        count = self.editor.replace_all(mapping, first, last)
+        print("Successfully replaced", count, "occurrences")
+
+    def undo(self):
+        """
+        Method undoes the last change of the text
+    
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.editor.undo():
+            print("Successfully undone")
+        else:
+            print("There is nothing to undo")
+
+    def redo(self):
+        """
+        Method repeats the last change that was undone
+    
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.editor.redo():
+            print("Successfully redone")
+        else:
+            print("There is nothing to redo")
+
+    def find(self, search):
+        """
+        Method prints the paragraphs that contain a text, with the positions
+        of the text in the paragraph
+    
+        Parameters
+        ----------
+        search : str
+            text to be found
+
+        Returns
+        -------
+        None.
+    
+        """
+        hits = self.editor.find(search)
+        for number, offsets in hits:
+            print(number, ": offsets", ", ".join(map(str, offsets)))
+        if hits:
+            print("Found", sum(len(offsets) for _, offsets in hits),
+                  "occurrences in", len(hits), "paragraphs")
+        else:
+            print("No paragraph contains", search)
+
+    def load(self, path):
+        """
+        Method loads a text file into the editor, every line is a paragraph
+    
+        Parameters
+        ----------
+        path : str
+            path of the file
+
+        Returns
+        -------
+        None.
+    
+        """
+        try:
+            self.editor.load(path)
+        except OSError as error:
+            print("The file could not be loaded:", error.strerror)
+        else:
+            print("Successfully loaded", self.get_last_n(), "paragraphs")
+
+    def save(self, path):
+        """
+        Method saves the text and the format. Saving to the same path again
+        only writes the changes since the last save.
+    
+        Parameters
+        ----------
+        path : str
+            path of the saved text
+
+        Returns
+        -------
+        None.
+    
+        """
+        try:
+            self.editor.save(path)
+        except OSError as error:
+            print("The text could not be saved:", error.strerror)
+        else:
+            print("Successfully saved")
+
+    def open(self, path):
+        """
+        Method opens a text that was saved with SAVE as a new document of
+        the workspace, or switches to it if it is already open
+    
+        Parameters
+        ----------
+        path : str
+            path of the saved text
+
+        Returns
+        -------
+        None.
+    
+        """
+        try:
+            if self.workspace is None:
+                self.editor.open(path)
+            else:
+                self.editor = self.workspace.open(path).editor
+        except OSError as error:
+            print("The text could not be opened:", error.strerror)
+        except ValueError:
+            print("The text could not be opened: the file is damaged")
+        else:
+            print("Successfully opened", self.get_last_n(), "paragraphs")
+
+    def switch(self, name=False):
+        """
+        Method switches to another document of the workspace, a new empty
+        document is created if there is none with the name. Without a name
+        the open documents are listed
+    
+        Parameters
+        ----------
+        name : bool / str
+            False if no name is given, else name of the document
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.workspace is None:
+            print("Only one document can be edited here")
+            return
+        if name == False:
+            for document in self.workspace.documents.values():
+                marker = "*" if document is self.workspace.current else " "
+                state = " (on disk)" if document.editor is None else ""
+                print(marker, document.name + state)
+            return
+        self.editor = self.workspace.switch(name).editor
+        print("Switched to", name, "with", self.get_last_n(), "paragraphs")
+
+    def close(self, name=False):
+        """
+        Method closes a document of the workspace, changes that were not
+        saved are lost
+    
+        Parameters
+        ----------
+        name : bool / str
+            False if no name is given to close the current document, else
+            name of the document
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.workspace is None:
+            print("Only one document can be edited here")
+            return
+        name = self.workspace.current.name if name == False else name
+        if name not in self.workspace.documents:
+            print("There is no document", name)
+            return
+        self.editor = self.workspace.close(name).editor
+        print("Closed", name + ", current document is",
+              self.workspace.current.name)
+
     def change_format_to_raw(self):
         """
         Method changes the current format to raw
@@ -226,6 +714,7 @@ class EditorUI:
         None.
     
         """
+        self.index_used = True
         word_index = self.editor.index()
         # output
         for term in word_index:
@@ -235,25 +724,133 @@ class EditorUI:
                 ]
                 print(term, " ", ', '.join(term_paragraphs))
 
-    def print_text(self):
+    def print_text(self, parameter=False):
         """
-        Method prints the content of the editor
+        Method prints the content of the editor, or only the paragraphs n to
+        m. The lines are formatted while they are printed and written in
+        large blocks.
     
         Parameters
         ----------
-        None.
+        parameter : bool / int / tuple
+            False to print the whole text, n for paragraph n or (n, m) for
+            the paragraphs n to m
 
         Returns
         -------
         None.
     
         """
-        text = self.editor.get_text_in_format()
-        if len(text) == 0:
+        if self.editor.get_paragraph_count() == 0:
             print("Your editor does not have any text in it yet...")
+            return
+        if parameter == False:
+            first, last = 1, None
+        elif isinstance(parameter, tuple):
+            first, last = parameter
         else:
-            for column in text:
-                print(column)
+            first, last = parameter, parameter
+        block = []
+        for column in self.editor.iter_text_in_format(first, last):
+            block.append(column)
+            if len(block) >= self.print_block_size:
+                sys.stdout.write("\n".join(block) + "\n")
+                block = []
+        if block:
+            sys.stdout.write("\n".join(block) + "\n")
+
+    def print_changes(self):
+        """
+        Method prints only what changed in the output since the last PRINT
+        CHANGES (see Editor.print_changes). Every change starts with a line
+        '@@ -a,b +c,d @@' like a unified diff: b lines from line a of the
+        last output were replaced by d lines from line c, followed by the
+        paragraph numbers and the new lines, each with a leading '+'. The
+        first PRINT CHANGES prints the whole text this way.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        changes = self.editor.print_changes()
+        if not changes:
+            print("No changes since the last print")
+            return
+        block = []
+        for old_line, old_count, new_line, new_count, first, last, lines \
+                in changes:
+            if last < first:
+                paragraphs = "removed before paragraph " + str(first)
+            elif last == first:
+                paragraphs = "paragraph " + str(first)
+            else:
+                paragraphs = "paragraphs " + str(first) + "-" + str(last)
+            block.append("@@ -" + str(old_line) + "," + str(old_count)
+                         + " +" + str(new_line) + "," + str(new_count)
+                         + " @@ " + paragraphs)
+            block.extend("+" + line.rstrip("\n") for line in lines)
+            if len(block) >= self.print_block_size:
+                sys.stdout.write("\n".join(block) + "\n")
+                block = []
+        if block:
+            sys.stdout.write("\n".join(block) + "\n")
+
+    def memory(self):
+        """
+        Method prints how much memory the paragraphs use and how much is
+        saved because paragraphs with the same content are shared
+    
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+    
+        """
+        report = self.editor.memory_report()
+        print("Paragraphs:", report["paragraphs"], "(" + str(report["unique"]),
+              "different)")
+        print("Memory of the paragraphs:", report["bytes"], "bytes")
+        print("Without sharing:", report["bytes_without_sharing"], "bytes")
+        saved = report["saved_bytes"]
+        percent = 100 * saved / (report["bytes_without_sharing"] or 1)
+        print("Saved:", saved, "bytes", f"({percent:.1f} %)")
+        print("Formatted paragraphs in the cache:", report["format_cache"],
+              "(widths " + ", ".join(map(str, report["format_widths"])) + ")")
+        print("Split paragraphs in the cache:", report["token_cache"])
+        if "store" in report:
+            store = report["store"]
+            print("Compressed blocks:", store["blocks"], "with",
+                  store["compressed_bytes"], "bytes,", store["hot_blocks"],
+                  "decompressed")
+            print("Block accesses:", store["hits"], "hits,", store["misses"],
+                  "misses")
+
+    def print_stats(self):
+        """
+        Method prints the time of every command, split into the phases
+        split, validate, run and output
+    
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+    
+        """
+        if self.stats is None:
+            print("Statistics are not recorded, start the editor with --stats")
+            return
+        print("\n".join(self.stats.report()))
 
     def exit(self):
         """
@@ -337,7 +934,7 @@ class EditorUI:
         The last paragraph number.
     
         """
-        return len(self.editor.text)
+        return self.editor.get_paragraph_count()
     
     def split_command(self, command):
         """
@@ -351,10 +948,25 @@ class EditorUI:
         -------
         (command, parameter) : tuple
             Tuple with command and parameter. If command or parameter is not given
-            it returns False for its value
+            it returns False for its value. For commands with a range the
+            parameter is a tuple (n, m), also for 'ADD n xk' and 'DUMMY n xk'
+            with m = n + k - 1. For commands with an argument it is the
+            argument as str, without leading and trailing spaces except for
+            the search text of FIND
     
         """
         command_split = command.split(" ")
+        for argument_command in (
+                self.editor.commands_with_argument
+                + self.editor.commands_with_optional_argument):
+            # the argument is kept as it is, e.g. 'LOAD my text.txt'
+            words = len(argument_command.split(" "))
+            if " ".join(command_split[:words]).upper() == argument_command:
+                argument = " ".join(command_split[words:])
+                if argument_command not in \
+                        self.editor.commands_searching_text:
+                    argument = argument.strip()
+                return (argument_command, argument or False)
         if len(command_split) <= 0:
             return (False, False)
         else:
@@ -362,9 +974,33 @@ class EditorUI:
             # Some commands have the option to define the parameter n,
             # which indicates the paragraph n
             # if a parameter has been entered, it would be the last element
+            first, _, last = parameter.partition("-")
+            if first.isnumeric() and last.isnumeric():
+                range_command = " ".join(command_split[:-1]).upper()
+                if range_command in self.editor.commands_with_range:
+                    # range n-m, e.g. 'DEL 3-5'
+                    return (range_command, (int(first), int(last)))
+            if parameter[:1] in ("x", "X", "×") and parameter[1:].isnumeric() \
+                    and int(parameter[1:]) > 0:
+                # k new paragraphs, e.g. 'ADD 3 x4' for the paragraphs 3 to 6
+                words = command_split[:-1]
+                if len(words) > 1 and words[-1].isnumeric():
+                    first = int(words.pop())
+                else:
+                    first = self.define_n(add=True)
+                count_command = " ".join(words).upper()
+                if count_command in self.editor.commands_adding_text:
+                    return (count_command,
+                            (first, first + int(parameter[1:]) - 1))
             if parameter.isnumeric():
                 # check if the last element is numeric and therefore parameter n
                 command = " ".join(command_split[:-1])
+                if len(command_split) > 2 and command_split[-2].isnumeric():
+                    range_command = " ".join(command_split[:-2]).upper()
+                    if range_command in self.editor.commands_with_range:
+                        # two numbers n m, e.g. 'PRINT 3 5'
+                        return (range_command,
+                                (int(command_split[-2]), int(parameter)))
             command = command.upper()
             if parameter.isnumeric():
             # returns a tuple if there is a numeric parameter n
@@ -377,7 +1013,8 @@ class EditorUI:
 if __name__ == "__main__":
 
     my_editor_ui = EditorUI()
-    my_editor_ui.editor.text = ["ABCD", "EFGH", "IJKL","1234"]  # sample text
+    for sample in ["ABCD", "EFGH", "IJKL","1234"]:  # sample text
+        my_editor_ui.editor.add_n(sample, my_editor_ui.get_last_n() + 1)
 
     # test: Start and Exit Editor
     print("\nTest: Start and Exit Editor")
@@ -421,3 +1058,43 @@ if __name__ == "__main__":
     print(my_editor_ui.editor.current_format)  # expected result: ('raw',0)
     my_editor_ui.change_format_to_fix(20)
     print(my_editor_ui.editor.current_format)  # expected result: ('fix',20)
+
+    # test: print a range of paragraphs
+    print("\nTest: Print range")
+    my_editor_ui.change_format_to_raw()
+    print(my_editor_ui.split_command("print 2 3"))  # expected: ('PRINT', (2, 3))
+    my_editor_ui.print_text((2, 3))  # expected output: 2 : EFGH, 3 : IJKL
+
+    # test: the search text of FIND keeps its spaces
+    print("\nTest: Find")
+    print(my_editor_ui.split_command("find  GH "))
+    # expected output: ('FIND', ' GH ')
+    print(my_editor_ui.split_command("load  text.txt "))
+    # expected output: ('LOAD', 'text.txt')
+
+    # test: print only the changes
+    print("\nTest: Print changes")
+    my_editor_ui.print_changes()
+    # expected output: @@ -1,0 +1,4 @@ paragraphs 1-4, +1 : ABCD, ...
+    my_editor_ui.editor.replace("EF", "ef", 2)
+    my_editor_ui.print_changes()
+    # expected output: @@ -2,1 +2,1 @@ paragraph 2, +2 : efGH
+    my_editor_ui.print_changes()  # expected output: No changes since ...
+
+    # test: batch mode
+    print("\nTest: Batch mode")
+    batch_editor_ui = EditorUI()
+    batch_editor_ui.run_batch(["ADD 99", "DEL 1", "ADD", "Hund",
+                               "REPLACE 5", "EXIT", "Katze", "PRINT", "EXIT"])
+    # expected output: Not a valid parameter. Please try again.,
+    # Successfully added paragraph, Not a valid parameter. Please try again.,
+    # 1 : Hund (the paragraph 'DEL 1' of the rejected ADD and the texts
+    # 'EXIT' and 'Katze' of the rejected REPLACE are skipped)
+
+    # test: input that is not a command gets a single row in STATS
+    print("\nTest: Stats of invalid input")
+    stats_editor_ui = EditorUI(stats=True)
+    for user_command in ("zwei", "drei", "DEL 99", "FORMAT RAW"):
+        stats_editor_ui.execute_command_timed(user_command)
+    print(sorted({command for command, _ in stats_editor_ui.stats.histograms}))
+    # expected output: ['?', 'DEL', 'FORMAT RAW']
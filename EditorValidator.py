@@ -17,12 +17,38 @@ import string
 from Editor import Editor
 
 
+class DeletionTable(dict):
+
+    def __init__(self, valid_inputs):
+        # translation table for str.translate: valid characters are mapped
+        # to themselves, all others to None, which deletes them
+        super().__init__((ord(character), ord(character))
+                         for character in valid_inputs)
+
+    def __missing__(self, codepoint):
+        # every character that is not valid is only looked up once
+        self[codepoint] = None
+        return None
+
+
 class Validator:
 
-    def __init__(self, commands, commands_with_parameter, commands_adding_text):
+    def __init__(self, commands, commands_with_parameter, commands_adding_text,
+                 commands_with_argument=()):
         self.valid_commands = commands
         self.valid_commands_with_parameter = commands_with_parameter
         self.valid_commands_adding_text = commands_adding_text
+        self.valid_commands_with_argument = commands_with_argument
+
+        alphabet      = list(string.ascii_letters)
+        numbers       = [str(i) for i in range(0, 10)]
+        umlauts       = ["ä", "ö", "ü", "Ä", "Ö", "Ü"]
+        character_set = list('.,:;-!?’()"%@+*[]{}/\\&#$ ')
+        valid_inputs  = alphabet + numbers + umlauts + character_set
+        self.deletion_table = DeletionTable(valid_inputs)
+        # table for validate_new_paragraph, built once per validator
+        self.batch_deletion_table = DeletionTable(valid_inputs + ["\n"])
+        # same table, but keeps the newlines between paragraphs
 
     def input_is_valid(self, command, text_length):
         """
@@ -57,6 +83,10 @@ class Validator:
                 text = "Format fix needs parameter bigger than 0"
                 check = (False, text)
 
+        elif not self.argument_is_given(command):
+            text = command[0].capitalize() + " needs an argument"
+            check = (False, text)
+
         return check
 
     def command_is_valid(self, command):
@@ -118,6 +148,14 @@ class Validator:
         parameter = command[1]
         if commando == "FORMAT FIX":
             pass
+        elif isinstance(parameter, tuple):  # range of paragraphs n to m
+            first, last = parameter
+            if commando in self.valid_commands_adding_text:
+                # the new paragraphs n to m, n can be after the last one
+                if not 1 <= first <= min(last, text_length + 1):
+                    check = False
+            elif not 1 <= first <= last <= text_length:
+                check = False
         elif ((commando not in self.valid_commands_adding_text 
                 and parameter > text_length) 
             or (commando in self.valid_commands_adding_text 
@@ -126,6 +164,26 @@ class Validator:
             check = False
         return check
     
+    def argument_is_given(self, command):
+        """
+        Checks if a command that needs a text argument, e.g. LOAD <path>,
+        has one
+
+        Parameters
+        ----------
+        command : tuple
+            preformatted command from the user
+
+        Returns
+        -------
+        check : bool
+            Result from the check
+        """
+        check = True  # by default check is True, unless it's proven False
+        if command[0] in self.valid_commands_with_argument and not command[1]:
+            check = False
+        return check
+
     def format_fix_has_parameter(self, command):
         check = True  # by default check is True, unless it's proven False
         if command[0] == "FORMAT FIX" and not command[1]:
@@ -150,18 +208,35 @@ class Validator:
             filtered paragraph
 
         """
-        alphabet      = list(string.ascii_letters)
-        numbers       = [str(i) for i in range(0, 10)]
-        umlauts       = ["ä", "ö", "ü", "Ä", "Ö", "Ü"]
-        character_set = list('.,:;-!?’()"%@+*[]{}/\&#$ ')
-        valid_inputs  = alphabet + numbers + umlauts + character_set
-
-        filtered_paragraph = ""
-        for character in new_paragraph:
-            if character in valid_inputs:
-                filtered_paragraph += character
+        filtered_paragraph = new_paragraph.translate(self.deletion_table)
 
         return filtered_paragraph
+
+    def validate_many(self, paragraphs):
+        """
+        Validates a batch of paragraphs like validate_new_paragraph, but
+        filters all of them with a single pass over the joined text.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+            paragraphs to validate
+
+        Returns
+        -------
+        filtered_paragraphs : list
+            filtered paragraphs in the same order
+
+        """
+        paragraphs = list(paragraphs)
+        if not paragraphs:
+            return []
+        joined = "\n".join(paragraphs)
+        if joined.count("\n") != len(paragraphs) - 1:
+            # a paragraph contains a newline, which has to be removed
+            return [self.validate_new_paragraph(paragraph)
+                    for paragraph in paragraphs]
+        return joined.translate(self.batch_deletion_table).split("\n")
     
     def text_is_given(self, text):
         """
@@ -251,10 +326,15 @@ if __name__ == "__main__":
     print("\nTest: paragraph_number_is_valid (valid cases)")
     print(validator.paragraph_number_is_valid(("ADD", 1), 3))
     print(validator.paragraph_number_is_valid(("ADD", 2), 1))
+    print(validator.paragraph_number_is_valid(("ADD", (4, 10)), 3))
+    print(validator.paragraph_number_is_valid(("DEL", (2, 3)), 3))
 
     # test invalid cases from paragraph_number_is_valid
     print("\nTest: paragraph_number_is_valid (invalid cases)")
     print(validator.paragraph_number_is_valid(("ADD", 74), 30))
+    print(validator.paragraph_number_is_valid(("ADD", (5, 10)), 3))
+    print(validator.paragraph_number_is_valid(("DEL", (2, 4)), 3))
+    print(validator.paragraph_number_is_valid(("DEL", (3, 2)), 3))
 
     # test valid cases from format_fix_has_parameter
     print("\nTest: format_fix_has_parameter (valid cases)")
@@ -272,6 +352,11 @@ if __name__ == "__main__":
     print("\nTest: validate_new_paragraph (invalid cases)")
     print(validator.validate_new_paragraph("£"))
 
+    # test validate_many
+    print("\nTest: validate_many")
+    print(validator.validate_many(["Ab£c", "", "x\ny"]))
+    # expected output: ['Abc', '', 'xy']
+
     # test valid cases from text_is_given
     print("\nTest: text_is_given (valid cases)")
     print(validator.text_is_given("Test-Text"))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Fenwick Tree """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+
+class FenwickTree:
+
+    def __init__(self, values=()):
+        self.tree = [0]
+        self.tree.extend(values)
+        # tree[i] holds the sum of values[i - lowbit(i):i], tree[0] is unused
+        for i in range(1, len(self.tree)):
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return len(self.tree) - 1
+
+    def add(self, i, delta):
+        """
+        Adds delta to the value at position i in O(log n).
+
+        Parameters
+        ----------
+        i : int
+            0-based position
+        delta : int
+
+        Returns
+        -------
+        None.
+
+        """
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """
+        Returns the sum of the values before position i in O(log n).
+
+        Parameters
+        ----------
+        i : int
+            0-based position, the value at i is not included
+
+        Returns
+        -------
+        total : int
+
+        """
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, total):
+        """
+        Finds the position whose value contains the running sum total, so that
+        prefix(i) <= total < prefix(i + 1). All values must be non-negative.
+
+        Parameters
+        ----------
+        total : int
+
+        Returns
+        -------
+        (i, rest) : tuple
+            position i and the part of total that lies inside position i.
+            i is len(self) if total is not smaller than the sum of all values
+
+        """
+        i = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            if i + step < len(self.tree) and self.tree[i + step] <= total:
+                i += step
+                total -= self.tree[i]
+            step >>= 1
+        return i, total
+
+
+if __name__ == "__main__":
+    print("\nTest: FenwickTree")
+    fenwick = FenwickTree([3, 0, 2, 5])
+    print(fenwick.prefix(3))  # expected output: 5
+    print(fenwick.find(5))  # expected output: (3, 0)
+    fenwick.add(1, 4)
+    print(fenwick.find(5))  # expected output: (1, 2)
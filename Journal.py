@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Journal """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import json
+import os
+
+
+JOURNAL_OPERATIONS = ("add_n", "del_n", "dummy_n", "add_many", "del_range",
+                      "dummy_many", "replace", "replace_all", "change_format")
+# editor methods that are written to the journal and replayed on open.
+# every other change of the text (e.g. LOAD) needs a new checkpoint.
+
+
+class Journal:
+
+    def __init__(self, path, checkpoint_interval=100000):
+        # A saved document consists of two files:
+        #   <path>                 checkpoint: a header line with the
+        #                          generation and the format, then every
+        #                          paragraph as a JSON string on its own line
+        #   <path>.<generation>.journal
+        #                          the edits since that checkpoint, one JSON
+        #                          list [operation, arguments...] per line
+        # A checkpoint is written to a temporary file and renamed, so the old
+        # checkpoint and its journal stay valid until the new one is
+        # complete. A record that was only partly written is ignored.
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.generation = 0
+        self.journal_records = 0  # records in the current journal file
+        self.pending = []  # records since the last save
+        self.needs_checkpoint = True
+
+    def journal_path(self, generation):
+        return self.path + "." + str(generation) + ".journal"
+
+    def record(self, operation, arguments):
+        """
+        Remembers an edit of the editor. Used as editor listener (see
+        Editor.add_listener).
+
+        Parameters
+        ----------
+        operation : str
+            name of the editor method
+        arguments : tuple
+            arguments of the method
+
+        Returns
+        -------
+        None.
+
+        """
+        if operation in JOURNAL_OPERATIONS:
+            self.pending.append(json.dumps([operation, *arguments],
+                                           ensure_ascii=False))
+        else:
+            self.needs_checkpoint = True
+
+    def save(self, editor):
+        """
+        Saves the edits since the last save by appending them to the
+        journal. A checkpoint with the whole text is written instead for the
+        first save, after a LOAD, or when the journal gets longer than
+        checkpoint_interval records.
+
+        Parameters
+        ----------
+        editor : Editor
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.needs_checkpoint or (self.journal_records + len(self.pending)
+                                     > self.checkpoint_interval):
+            self.checkpoint(editor)
+            return
+        if self.pending:
+            with open(self.journal_path(self.generation), "a",
+                      encoding="utf-8") as journal:
+                journal.write("\n".join(self.pending) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+            self.journal_records += len(self.pending)
+            self.pending = []
+
+    def checkpoint(self, editor):
+        """
+        Writes the whole text as a new checkpoint and starts a new, empty
+        journal.
+
+        Parameters
+        ----------
+        editor : Editor
+
+        Returns
+        -------
+        None.
+
+        """
+        generation = self.generation + 1
+        if os.path.exists(self.path):  # continue after the generation on disk
+            generation = max(generation, self.read_header()["generation"] + 1)
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as checkpoint:
+            header = {"generation": generation,
+                      "format": list(editor.current_format),
+                      "paragraphs": editor.get_paragraph_count()}
+            checkpoint.write(json.dumps(header) + "\n")
+            block = []
+            for paragraph in editor.text:
+                block.append(json.dumps(paragraph, ensure_ascii=False))
+                if len(block) >= 4096:
+                    checkpoint.write("\n".join(block) + "\n")
+                    block = []
+            if block:
+                checkpoint.write("\n".join(block) + "\n")
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+        os.replace(temporary_path, self.path)
+        for old_generation in (self.generation, generation - 1):
+            if os.path.exists(self.journal_path(old_generation)):
+                os.remove(self.journal_path(old_generation))
+        self.generation = generation
+        self.journal_records = 0
+        self.pending = []
+        self.needs_checkpoint = False
+
+    def read_header(self):
+        # reads the first line of the checkpoint
+        with open(self.path, encoding="utf-8") as checkpoint:
+            return json.loads(checkpoint.readline())
+
+    def restore(self, editor):
+        """
+        Loads the newest checkpoint into the editor and replays the journal
+        that belongs to it. A record that is damaged, is not an edit of
+        JOURNAL_OPERATIONS or whose edit fails (e.g. a paragraph number that
+        does not exist) ends the journal.
+
+        Parameters
+        ----------
+        editor : Editor
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(self.path, encoding="utf-8") as checkpoint:
+            header = json.loads(checkpoint.readline())
+            paragraphs = [json.loads(line) for line in checkpoint]
+        if len(paragraphs) != header["paragraphs"]:
+            raise ValueError("checkpoint is incomplete: " + self.path)
+        editor.set_text(paragraphs)
+        editor.change_format(*header["format"])
+        self.generation = header["generation"]
+        self.journal_records = 0
+        if os.path.exists(self.journal_path(self.generation)):
+            with open(self.journal_path(self.generation), "rb+") as journal:
+                end = 0  # end of the last complete record
+                for line in journal:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("record was not completed")
+                        operation, *arguments = json.loads(line)
+                        if operation not in JOURNAL_OPERATIONS:
+                            # only edits are replayed, never e.g. load or
+                            # save with a path from the file
+                            raise ValueError("not an edit: " + str(operation))
+                        getattr(editor, operation)(*arguments)
+                    except (ValueError, IndexError, TypeError):
+                        # cut off the record that was only partly written or
+                        # damaged, so the next save appends after the last
+                        # record that was replayed
+                        journal.truncate(end)
+                        break
+                    self.journal_records += 1
+                    end += len(line)
+        self.pending = []
+        self.needs_checkpoint = False
+
+
+if __name__ == "__main__":
+    import tempfile
+    from Editor import Editor
+
+    print("\nTest: save and open")
+    path = os.path.join(tempfile.mkdtemp(), "text.json")
+    editor = Editor()
+    editor.save(path)
+    editor.add_n("Hund Katze", 1)
+    editor.dummy_n(2)
+    editor.change_format("fix", 20)
+    editor.save(path)  # only appends three records
+    reopened = Editor()
+    reopened.open(path)
+    print(list(reopened.text) == list(editor.text))  # expected output: True
+    print(reopened.current_format)  # expected output: ('fix', 20)
+    print(len(reopened.undo_history))  # expected output: 0
+
+    print("\nTest: a record that is not an edit is not replayed")
+    with open(Journal(path).journal_path(1), "a", encoding="utf-8") as file:
+        file.write(json.dumps(["save", path + ".copy"]) + "\n")
+        file.write(json.dumps(["del_n", 1]) + "\n")
+    reopened.open(path)
+    print(os.path.exists(path + ".copy"), reopened.get_paragraph_count())
+    # expected output: False 2
+
+    print("\nTest: an edit that fails ends the journal")
+    for record in (["del_n", 999999], ["add_n"], 7):
+        with open(Journal(path).journal_path(1), "a",
+                  encoding="utf-8") as file:
+            file.write(json.dumps(["dummy_n", 1]) + "\n")
+            file.write(json.dumps(record) + "\n")
+        reopened.open(path)
+        print(reopened.get_paragraph_count(), end=" ")
+    print()
+    # expected output: 3 4 5, the dummies before the records are replayed,
+    # the records and what comes after them are cut off
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Line Counts """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+from array import array
+
+from FenwickTree import FenwickTree
+
+
+class LineCounts:
+
+    def __init__(self, counts=(), chunk_size=512):
+        # The number of output lines of every paragraph, in chunks like
+        # ParagraphIds. One Fenwick tree sums up the paragraphs of the
+        # chunks, another one their lines, so the paragraph of an output
+        # line is found in O(log n + chunk_size) and adding, deleting or
+        # wrapping a paragraph again only changes its chunk.
+        self.chunk_size = chunk_size
+        counts = array("L", counts)
+        self.chunks = [counts[start:start + chunk_size]
+                       for start in range(0, len(counts), chunk_size)]
+        if not self.chunks:
+            self.chunks.append(array("L"))
+        self.count = len(counts)
+        self.renumber()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        number, offset = self.locate(self.position(index))
+        return self.chunks[number][offset]
+
+    def __setitem__(self, index, count):
+        number, offset = self.locate(self.position(index))
+        chunk = self.chunks[number]
+        self.lines.add(number, count - chunk[offset])
+        chunk[offset] = count
+
+    def total(self):
+        """
+        Returns the number of output lines of all paragraphs.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        total : int
+
+        """
+        return self.lines.prefix(len(self.chunks))
+
+    def insert(self, index, count):
+        """
+        Inserts the line count of a new paragraph before position index,
+        like list.insert.
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        count : int
+            number of output lines of the paragraph
+
+        Returns
+        -------
+        None.
+
+        """
+        if index < 0:
+            index = max(index + self.count, 0)
+        index = min(index, self.count)
+        if index == self.count:  # append to the last chunk
+            number = len(self.chunks) - 1
+            offset = len(self.chunks[number])
+        else:
+            number, offset = self.locate(index)
+        chunk = self.chunks[number]
+        chunk.insert(offset, count)
+        self.count += 1
+        self.sizes.add(number, 1)
+        self.lines.add(number, count)
+        if len(chunk) > 2 * self.chunk_size:
+            self.split(number)
+
+    def pop(self, index=-1):
+        """
+        Removes the line count at position index and returns it, like
+        list.pop.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph
+
+        Returns
+        -------
+        count : int
+            The removed line count
+
+        """
+        number, offset = self.locate(self.position(index))
+        chunk = self.chunks[number]
+        count = chunk.pop(offset)
+        self.count -= 1
+        if not chunk and len(self.chunks) > 1:
+            self.chunks.pop(number)
+            self.renumber()
+        else:
+            self.sizes.add(number, -1)
+            self.lines.add(number, -count)
+        return count
+
+    def line_of(self, index):
+        """
+        Returns the 0-based output line at which a paragraph starts.
+
+        Parameters
+        ----------
+        index : int
+            0-based position of the paragraph, len(self) for the end of the
+            text
+
+        Returns
+        -------
+        line : int
+
+        """
+        if index == self.count:
+            return self.total()
+        number, offset = self.locate(self.position(index))
+        return self.lines.prefix(number) + sum(self.chunks[number][:offset])
+
+    def paragraph_of(self, line):
+        """
+        Returns the paragraph that contains an output line.
+
+        Parameters
+        ----------
+        line : int
+            0-based output line
+
+        Returns
+        -------
+        (index, offset) : tuple
+            0-based position of the paragraph and of the line within it
+
+        Raises
+        ------
+        IndexError
+            if the text has less than line + 1 output lines
+
+        """
+        if not 0 <= line < self.total():
+            raise IndexError("line out of range")
+        number, rest = self.lines.find(line)
+        index = self.sizes.prefix(number)
+        for count in self.chunks[number]:
+            if rest < count:
+                break
+            rest -= count
+            index += 1
+        return index, rest
+
+    def locate(self, index):
+        # returns the chunk number and the offset inside the chunk of a
+        # position
+        return self.sizes.find(index)
+
+    def position(self, index):
+        # turns a list like index into a valid position
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("paragraph index out of range")
+        return index
+
+    def split(self, number):
+        # splits an overfull chunk in two halves
+        chunk = self.chunks[number]
+        half = len(chunk) // 2
+        self.chunks.insert(number + 1, chunk[half:])
+        del chunk[half:]
+        self.renumber()
+
+    def renumber(self):
+        # called after chunks were added or removed
+        self.sizes = FenwickTree(map(len, self.chunks))
+        self.lines = FenwickTree(map(sum, self.chunks))
+
+
+if __name__ == "__main__":
+    print("\nTest: LineCounts")
+    line_counts = LineCounts([1, 3, 2], chunk_size=1)
+    print(line_counts.total(), line_counts.paragraph_of(3))
+    # expected output: 6 (1, 2)
+    line_counts.insert(0, 4)
+    line_counts[2] = 1
+    print(list(map(line_counts.__getitem__, range(len(line_counts)))))
+    # expected output: [4, 1, 1, 2]
+    print(line_counts.pop(1), line_counts.line_of(2), line_counts.total())
+    # expected output: 1 5 7
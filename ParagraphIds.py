@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Paragraph Ids """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+from FenwickTree import FenwickTree
+
+
+class _Chunk:
+
+    def __init__(self, ids, number):
+        self.ids = ids
+        self.number = number  # position of the chunk in ParagraphIds.chunks
+
+
+class ParagraphIds:
+
+    def __init__(self, count=0, chunk_size=512):
+        # Every paragraph gets an id that never changes, even if paragraphs
+        # before it are added or deleted. Indexes refer to paragraphs by id
+        # and ask this sequence for the current paragraph number.
+        self.chunk_size = chunk_size
+        self.next_id = count
+        self.chunks = [_Chunk(list(range(start, min(start + chunk_size,
+                                                     count))), number)
+                       for number, start in enumerate(range(0, count,
+                                                            chunk_size))]
+        if not self.chunks:
+            self.chunks.append(_Chunk([], 0))
+        self.chunk_of = {}
+        # key: id, value: chunk that contains the id
+        for chunk in self.chunks:
+            for paragraph_id in chunk.ids:
+                self.chunk_of[paragraph_id] = chunk
+        self.sizes = FenwickTree(len(chunk.ids) for chunk in self.chunks)
+
+    def __len__(self):
+        return len(self.chunk_of)
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk.ids
+
+    def __getitem__(self, index):
+        chunk, offset = self.locate(self.position(index))
+        return chunk.ids[offset]
+
+    def insert(self, index, paragraph_id=None):
+        """
+        Inserts an id before position index, like list.insert.
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        paragraph_id : int
+            id to insert, a new id is created if it is None
+
+        Returns
+        -------
+        paragraph_id : int
+            The inserted id
+
+        """
+        if paragraph_id is None:
+            paragraph_id = self.next_id
+            self.next_id += 1
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+        if index == length:  # append to the last chunk
+            chunk, offset = self.chunks[-1], len(self.chunks[-1].ids)
+        else:
+            chunk, offset = self.locate(index)
+        chunk.ids.insert(offset, paragraph_id)
+        self.chunk_of[paragraph_id] = chunk
+        self.sizes.add(chunk.number, 1)
+        if len(chunk.ids) > 2 * self.chunk_size:
+            self.split(chunk)
+        return paragraph_id
+
+    def pop(self, index=-1):
+        """
+        Removes the id at position index and returns it, like list.pop.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph
+
+        Returns
+        -------
+        paragraph_id : int
+            The removed id
+
+        """
+        chunk, offset = self.locate(self.position(index))
+        paragraph_id = chunk.ids.pop(offset)
+        del self.chunk_of[paragraph_id]
+        self.sizes.add(chunk.number, -1)
+        if not chunk.ids and len(self.chunks) > 1:
+            self.chunks.pop(chunk.number)
+            self.renumber()
+        return paragraph_id
+
+    def position_of(self, paragraph_id):
+        """
+        Returns the current 0-based position of a paragraph in
+        O(log n + chunk_size).
+
+        Parameters
+        ----------
+        paragraph_id : int
+
+        Returns
+        -------
+        position : int
+
+        """
+        chunk = self.chunk_of[paragraph_id]
+        return self.sizes.prefix(chunk.number) + chunk.ids.index(paragraph_id)
+
+    def positions(self):
+        """
+        Returns the positions of all ids with one pass over the sequence.
+        Cheaper than position_of when most of the ids are needed.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        positions : dict
+            key: id, value: 0-based position
+
+        """
+        return {paragraph_id: position
+                for position, paragraph_id in enumerate(self)}
+
+    def locate(self, index):
+        # returns the chunk and the offset inside the chunk of a position
+        number, offset = self.sizes.find(index)
+        return self.chunks[number], offset
+
+    def position(self, index):
+        # turns a list like index into a valid position
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("paragraph index out of range")
+        return index
+
+    def split(self, chunk):
+        # splits an overfull chunk in two halves
+        half = len(chunk.ids) // 2
+        new_chunk = _Chunk(chunk.ids[half:], chunk.number + 1)
+        del chunk.ids[half:]
+        for paragraph_id in new_chunk.ids:
+            self.chunk_of[paragraph_id] = new_chunk
+        self.chunks.insert(new_chunk.number, new_chunk)
+        self.renumber()
+
+    def renumber(self):
+        # called after chunks were added or removed
+        for number, chunk in enumerate(self.chunks):
+            chunk.number = number
+        self.sizes = FenwickTree(len(chunk.ids) for chunk in self.chunks)
+
+
+if __name__ == "__main__":
+    print("\nTest: ParagraphIds")
+    paragraph_ids = ParagraphIds(5, chunk_size=2)
+    print(list(paragraph_ids))  # expected output: [0, 1, 2, 3, 4]
+    paragraph_ids.insert(0)
+    paragraph_ids.pop(3)
+    print(list(paragraph_ids))  # expected output: [5, 0, 1, 3, 4]
+    print(paragraph_ids.position_of(4))  # expected output: 4
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Paragraph Pool """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import sys
+
+
+class ParagraphPool:
+
+    def __init__(self, enabled=True):
+        # Paragraphs with the same content share one string object. The pool
+        # is addressed by content (the str hash, which Python caches in the
+        # string) and counts how often the text contains every content.
+        # A disabled pool keeps nothing, e.g. for a store that compresses
+        # its paragraphs (see ParagraphStore).
+        self.enabled = enabled
+        self.entries = {}
+        # key: content, value: [shared string, number of references]
+        self.unique_bytes = 0  # memory of the shared strings
+        self.referenced_bytes = 0  # memory the references would need
+        # without sharing
+
+    def __len__(self):
+        return len(self.entries)
+
+    def intern(self, paragraph):
+        """
+        Returns the shared string with the content of paragraph and counts
+        the new reference.
+
+        Parameters
+        ----------
+        paragraph : str
+
+        Returns
+        -------
+        paragraph : str
+            shared string, equal to the given paragraph
+
+        """
+        if not self.enabled:
+            return paragraph
+        entry = self.entries.get(paragraph)
+        size = sys.getsizeof(paragraph)
+        if entry is None:
+            self.entries[paragraph] = entry = [paragraph, 0]
+            self.unique_bytes += size
+        entry[1] += 1
+        self.referenced_bytes += size
+        return entry[0]
+
+    def release(self, paragraph):
+        """
+        Counts a removed reference. The content is removed from the pool
+        with its last reference.
+
+        Parameters
+        ----------
+        paragraph : str
+
+        Returns
+        -------
+        removed : bool
+            True if this was the last reference, caches for the content can
+            be dropped then. Paragraphs that never went through intern()
+            (e.g. lines of a loaded file) are always the last reference
+
+        """
+        entry = self.entries.get(paragraph)
+        if entry is None:
+            return True
+        size = sys.getsizeof(paragraph)
+        entry[1] -= 1
+        self.referenced_bytes -= size
+        if entry[1] > 0:
+            return False
+        del self.entries[paragraph]
+        self.unique_bytes -= size
+        return True
+
+    def recount(self, paragraphs):
+        """
+        Counts the references again from the text, e.g. after UNDO replaced
+        the text with a snapshot. Contents that the text no longer contains
+        are removed, contents that it contains again are added.
+
+        Parameters
+        ----------
+        paragraphs : iterable
+            the whole text
+
+        Returns
+        -------
+        removed : list
+            contents that were removed, caches for them can be dropped
+
+        """
+        if not self.enabled:
+            return []
+        entries = {}
+        for paragraph in paragraphs:
+            entry = entries.get(paragraph)
+            if entry is None:
+                entries[paragraph] = [paragraph, 1]
+            else:
+                entry[1] += 1
+        removed = [content for content in self.entries
+                   if content not in entries]
+        self.entries = entries
+        self.unique_bytes = self.referenced_bytes = 0
+        for paragraph, count in entries.values():
+            size = sys.getsizeof(paragraph)
+            self.unique_bytes += size
+            self.referenced_bytes += count * size
+        return removed
+
+
+if __name__ == "__main__":
+    print("\nTest: ParagraphPool")
+    pool = ParagraphPool()
+    first = pool.intern("".join(["Hund ", "und Katze"]))
+    second = pool.intern("".join(["Hund und ", "Katze"]))
+    print(first is second)  # expected output: True
+    print(pool.release(first), pool.release(second))
+    # expected output: False True
+    print(len(pool))  # expected output: 0
+    text = [pool.intern("Hund"), pool.intern("Katze"), "Katze"]
+    # e.g. after UNDO, the last paragraph was not counted
+    print(pool.recount(text[1:]), pool.entries["Katze"][1])
+    # expected output: ['Hund'] 2
@@ -0,0 +1,1365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Paragraph Store """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import lzma
+import mmap
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+from FenwickTree import FenwickTree
+
+
+# A paragraph store is the sequence behind Editor.text. Every store offers
+# the part of the list interface the editor needs: len(), iteration,
+# indexing, assignment, insert() and pop(), plus iter_range() to iterate over
+# a part of the text and insert_many()/delete_range() to insert or remove
+# many paragraphs at once. Positions are 0-based and negative positions count
+# from the end, exactly like a list.
+
+# A store can also take snapshots of itself: snapshot() returns the current
+# version, restore() goes back to it and snapshot_size() estimates the bytes
+# that a snapshot keeps alive after the next edits.
+
+# nodes of the tree are immutable tuples: (left, value, right, size, height)
+_LEFT, _VALUE, _RIGHT, _SIZE, _HEIGHT = range(5)
+_NODE_BYTES = sys.getsizeof((None,) * 5) + sys.getsizeof(1 << 30)
+# approximate memory of a node
+_PIECE_LENGTH = 64
+# most new paragraphs in one piece of MappedParagraphStore, an edit copies
+# at most one such piece
+
+
+def _size(node):
+    return node[_SIZE] if node else 0
+
+
+def _height(node):
+    return node[_HEIGHT] if node else 0
+
+
+def _node(left, value, right):
+    # creates a node, size and height are derived from the subtrees
+    height_left = left[_HEIGHT] if left else 0
+    height_right = right[_HEIGHT] if right else 0
+    return (left, value, right, _size(left) + _size(right) + 1,
+            (height_left if height_left > height_right else height_right) + 1)
+
+
+def _balance(left, value, right, node=_node):
+    # creates a node and rotates if the heights differ by two. node creates
+    # the new nodes, _node or _piece_node
+    height_left, height_right = _height(left), _height(right)
+    if height_left > height_right + 1:
+        left_left, left_value, left_right = left[:3]
+        if _height(left_left) >= _height(left_right):
+            return node(left_left, left_value,
+                        node(left_right, value, right))
+        return node(node(left_left, left_value, left_right[_LEFT]),
+                    left_right[_VALUE],
+                    node(left_right[_RIGHT], value, right))
+    if height_right > height_left + 1:
+        right_left, right_value, right_right = right[:3]
+        if _height(right_right) >= _height(right_left):
+            return node(node(left, value, right_left), right_value,
+                        right_right)
+        return node(node(left, value, right_left[_LEFT]),
+                    right_left[_VALUE],
+                    node(right_left[_RIGHT], right_value, right_right))
+    return node(left, value, right)
+
+
+def _build(values, start, stop, node=_node):
+    # builds a perfectly balanced tree from values[start:stop]
+    if start >= stop:
+        return None
+    middle = (start + stop) // 2
+    return node(_build(values, start, middle, node), values[middle],
+                _build(values, middle + 1, stop, node))
+
+
+def _insert(node, index, value):
+    if node is None:
+        return (None, value, None, 1, 1)
+    left, node_value, right = node[:3]
+    size_left = _size(left)
+    if index <= size_left:
+        return _balance(_insert(left, index, value), node_value, right)
+    return _balance(left, node_value,
+                    _insert(right, index - size_left - 1, value))
+
+
+def _delete(node, index):
+    # returns the new tree and the removed value
+    left, node_value, right = node[:3]
+    size_left = _size(left)
+    if index < size_left:
+        left, value = _delete(left, index)
+        return _balance(left, node_value, right), value
+    if index > size_left:
+        right, value = _delete(right, index - size_left - 1)
+        return _balance(left, node_value, right), value
+    if left is None:
+        return right, node_value
+    if right is None:
+        return left, node_value
+    right, successor = _delete(right, 0)
+    return _balance(left, successor, right), node_value
+
+
+def _replace(node, index, value):
+    left, node_value, right, size, height = node
+    size_left = _size(left)
+    if index < size_left:
+        return (_replace(left, index, value), node_value, right, size,
+                height)
+    if index > size_left:
+        return (left, node_value, _replace(right, index - size_left - 1,
+                                           value), size, height)
+    return (left, value, right, size, height)
+
+
+# The pieces of MappedParagraphStore are kept in the same kind of tree, but
+# a node holds a piece of paragraphs and its size counts paragraphs instead
+# of nodes. Pieces are immutable: a range of line numbers of the file or a
+# tuple of new paragraphs. Edits split the tree at a position and join the
+# parts again, both in O(log pieces).
+
+
+def _piece_node(left, piece, right):
+    height_left = left[_HEIGHT] if left else 0
+    height_right = right[_HEIGHT] if right else 0
+    return (left, piece, right, _size(left) + len(piece) + _size(right),
+            (height_left if height_left > height_right else height_right) + 1)
+
+
+def _join(left, piece, right):
+    # joins two piece trees with a piece between them, the cost is the
+    # difference of their heights
+    height_left, height_right = _height(left), _height(right)
+    if height_left > height_right + 1:
+        return _balance(left[_LEFT], left[_VALUE],
+                        _join(left[_RIGHT], piece, right), _piece_node)
+    if height_right > height_left + 1:
+        return _balance(_join(left, piece, right[_LEFT]), right[_VALUE],
+                        right[_RIGHT], _piece_node)
+    return _piece_node(left, piece, right)
+
+
+def _concat(left, right):
+    # joins two piece trees
+    if left is None:
+        return right
+    if right is None:
+        return left
+    left, last = _pop_last(left)
+    return _join(left, last, right)
+
+
+def _pop_last(node):
+    # returns the piece tree without its last piece, and that piece
+    left, piece, right = node[:3]
+    if right is None:
+        return left, piece
+    right, last = _pop_last(right)
+    return _balance(left, piece, right, _piece_node), last
+
+
+def _split(node, index):
+    # splits a piece tree into the first index paragraphs and the rest, a
+    # piece that contains the position is cut
+    if node is None:
+        return None, None
+    left, piece, right = node[:3]
+    size_left = _size(left)
+    if index < size_left:
+        first, rest = _split(left, index)
+        return first, _join(rest, piece, right)
+    offset = index - size_left
+    if offset > len(piece):
+        first, rest = _split(right, offset - len(piece))
+        return _join(left, piece, first), rest
+    if offset == 0:
+        return left, _join(None, piece, right)
+    if offset == len(piece):
+        return _join(left, piece, None), right
+    return (_join(left, piece[:offset], None),
+            _join(None, piece[offset:], right))
+
+
+class ListParagraphStore:
+
+    def __init__(self, paragraphs=()):
+        self.paragraphs = list(paragraphs)
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def __iter__(self):
+        return iter(self.paragraphs)
+
+    def __getitem__(self, index):
+        return self.paragraphs[index]
+
+    def __setitem__(self, index, paragraph):
+        self.paragraphs[index] = paragraph
+
+    def __repr__(self):
+        return "ListParagraphStore(" + repr(self.paragraphs) + ")"
+
+    def insert(self, index, paragraph):
+        """
+        Inserts a paragraph before position index. Costs O(n), because all
+        following paragraphs are moved.
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        self.paragraphs.insert(index, paragraph)
+
+    def pop(self, index=-1):
+        """
+        Removes the paragraph at position index and returns it.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph to be removed
+
+        Returns
+        -------
+        paragraph : str
+            The removed paragraph
+
+        """
+        return self.paragraphs.pop(index)
+
+    def insert_many(self, index, paragraphs):
+        """
+        Inserts paragraphs before position index in O(n + k), the following
+        paragraphs are moved only once.
+
+        Parameters
+        ----------
+        index : int
+            position of the first new paragraph
+        paragraphs : list
+
+        Returns
+        -------
+        None.
+
+        """
+        self.paragraphs[index:index] = paragraphs
+
+    def delete_range(self, start, stop):
+        """
+        Removes the paragraphs from position start to stop-1 in O(n).
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph to be removed
+        stop : int
+            position after the last paragraph to be removed
+
+        Returns
+        -------
+        paragraphs : list
+            The removed paragraphs
+
+        """
+        removed = self.paragraphs[start:stop]
+        del self.paragraphs[start:stop]
+        return removed
+
+    def iter_range(self, start=0, stop=None):
+        """
+        Iterates over the paragraphs from position start to stop-1.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph
+        stop : int
+            position after the last paragraph, None for the end of the text
+
+        Returns
+        -------
+        paragraphs : iterator
+
+        """
+        return islice(self.paragraphs, start, stop)
+
+    def snapshot(self):
+        """
+        Returns a copy of the paragraphs in O(n).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        snapshot : tuple
+
+        """
+        return tuple(self.paragraphs)
+
+    def restore(self, snapshot):
+        """
+        Goes back to a version returned by snapshot.
+
+        Parameters
+        ----------
+        snapshot : tuple
+
+        Returns
+        -------
+        None.
+
+        """
+        self.paragraphs = list(snapshot)
+
+    def snapshot_size(self, edits=1):
+        # the copy holds a reference to every paragraph
+        return sys.getsizeof(self.paragraphs)
+
+
+class TreeParagraphStore:
+
+    def __init__(self, paragraphs=()):
+        paragraphs = list(paragraphs)
+        self.root = _build(paragraphs, 0, len(paragraphs))
+        # order statistic AVL tree, each node knows the size of its subtree
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __iter__(self):
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node[_LEFT]
+            node = stack.pop()
+            yield node[_VALUE]
+            node = node[_RIGHT]
+
+    def __getitem__(self, index):
+        node = self.root
+        index = self._position(index)
+        while True:
+            size_left = _size(node[_LEFT])
+            if index < size_left:
+                node = node[_LEFT]
+            elif index > size_left:
+                index -= size_left + 1
+                node = node[_RIGHT]
+            else:
+                return node[_VALUE]
+
+    def __setitem__(self, index, paragraph):
+        self.root = _replace(self.root, self._position(index), paragraph)
+
+    def __repr__(self):
+        return "TreeParagraphStore(" + repr(list(self)) + ")"
+
+    def insert(self, index, paragraph):
+        """
+        Inserts a paragraph before position index in O(log n).
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        self.root = _insert(self.root, min(index, length), paragraph)
+
+    def pop(self, index=-1):
+        """
+        Removes the paragraph at position index in O(log n) and returns it.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph to be removed
+
+        Returns
+        -------
+        paragraph : str
+            The removed paragraph
+
+        """
+        if self.root is None:
+            raise IndexError("pop from empty paragraph store")
+        self.root, paragraph = _delete(self.root, self._position(index))
+        return paragraph
+
+    def insert_many(self, index, paragraphs):
+        """
+        Inserts paragraphs before position index. A few paragraphs are
+        inserted one by one in O(k log n), otherwise the tree is built again
+        in O(n + k).
+
+        Parameters
+        ----------
+        index : int
+            position of the first new paragraph
+        paragraphs : list
+
+        Returns
+        -------
+        None.
+
+        """
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+        if len(paragraphs) * _height(self.root) < length:
+            for offset, paragraph in enumerate(paragraphs):
+                self.root = _insert(self.root, index + offset, paragraph)
+            return
+        values = list(self)
+        values[index:index] = paragraphs
+        self.root = _build(values, 0, len(values))
+
+    def delete_range(self, start, stop):
+        """
+        Removes the paragraphs from position start to stop-1, one by one or
+        by building the tree again like insert_many.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph to be removed
+        stop : int
+            position after the last paragraph to be removed
+
+        Returns
+        -------
+        paragraphs : list
+            The removed paragraphs
+
+        """
+        length = len(self)
+        stop = min(stop, length)
+        if start >= stop:
+            return []
+        if (stop - start) * _height(self.root) < length:
+            removed = []
+            for _ in range(stop - start):
+                self.root, paragraph = _delete(self.root, start)
+                removed.append(paragraph)
+            return removed
+        values = list(self)
+        removed = values[start:stop]
+        del values[start:stop]
+        self.root = _build(values, 0, len(values))
+        return removed
+
+    def iter_range(self, start=0, stop=None):
+        """
+        Iterates over the paragraphs from position start to stop-1. The first
+        paragraph is found in O(log n).
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph
+        stop : int
+            position after the last paragraph, None for the end of the text
+
+        Returns
+        -------
+        paragraphs : generator
+
+        """
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        count = stop - start
+        stack = []  # nodes that come after start and whose right subtree
+        node = self.root  # has not been visited yet
+        while node:
+            size_left = _size(node[_LEFT])
+            if start < size_left:
+                stack.append(node)
+                node = node[_LEFT]
+            elif start > size_left:
+                start -= size_left + 1
+                node = node[_RIGHT]
+            else:
+                stack.append(node)
+                node = None
+        while count > 0 and stack:
+            node = stack.pop()
+            yield node[_VALUE]
+            count -= 1
+            node = node[_RIGHT]
+            while node:
+                stack.append(node)
+                node = node[_LEFT]
+
+    def snapshot(self):
+        """
+        Returns the current version in O(1). Edits never change a node, they
+        copy the path to the changed node, so the old root stays valid.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        snapshot : tuple
+            root of the tree
+
+        """
+        return self.root
+
+    def restore(self, snapshot):
+        """
+        Goes back to a version returned by snapshot in O(1).
+
+        Parameters
+        ----------
+        snapshot : tuple
+
+        Returns
+        -------
+        None.
+
+        """
+        self.root = snapshot
+
+    def snapshot_size(self, edits=1):
+        # an edit copies a path from the root and rotates along it, the
+        # other nodes are shared with the snapshot
+        return edits * 2 * _height(self.root) * _NODE_BYTES
+
+    def _position(self, index):
+        # turns a list like index into a valid position in the tree
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("paragraph index out of range")
+        return index
+
+
+class MappedParagraphStore:
+
+    resident = False
+    # the lines of the file are decoded on every access, keeping them as
+    # strings elsewhere would read the whole file into memory
+
+    def __init__(self, path):
+        # The file is memory-mapped, every line is a paragraph. Only the end
+        # offsets of the lines are stored; a paragraph is decoded when it is
+        # accessed. Edits are kept in a piece table on top of the file: a
+        # piece is either a range of line numbers of the file or a tuple of
+        # new paragraphs. The pieces are kept in a persistent AVL tree (see
+        # _split and _join), so an edit costs O(log pieces) and a snapshot
+        # is the root.
+        self.path = path
+        self.file = open(path, "rb")
+        size = self.file.seek(0, 2)
+        self.base = None
+        self.line_ends = array("q")
+        if size > 0:
+            self.base = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            find = self.base.find
+            start = 0
+            while True:  # one scan for newlines over the whole file
+                end = find(b"\n", start)
+                if end < 0:
+                    break
+                self.line_ends.append(end)
+                start = end + 1
+            if start < size:  # last line without newline
+                self.line_ends.append(size)
+        self.root = None
+        if self.line_ends:
+            self.root = _piece_node(None, range(len(self.line_ends)), None)
+        self.file_root = self.root  # the text of the file without edits
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def __getitem__(self, index):
+        index = self.position(index)
+        node = self.root
+        while True:
+            size_left = _size(node[_LEFT])
+            piece = node[_VALUE]
+            if index < size_left:
+                node = node[_LEFT]
+            elif index >= size_left + len(piece):
+                index -= size_left + len(piece)
+                node = node[_RIGHT]
+            elif isinstance(piece, range):
+                return self.line(piece[index - size_left])
+            else:
+                return piece[index - size_left]
+
+    def __setitem__(self, index, paragraph):
+        index = self.position(index)
+        first, rest = _split(self.root, index)
+        self.root = _join(first, (paragraph,), _split(rest, 1)[1])
+
+    def __repr__(self):
+        return "MappedParagraphStore(" + repr(self.path) + ")"
+
+    def insert(self, index, paragraph):
+        """
+        Inserts a paragraph before position index in O(log pieces). The file
+        is not changed, the paragraph is added to the piece of new
+        paragraphs before it, or gets a piece of its own.
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        first, rest = _split(self.root, min(index, length))
+        piece = (paragraph,)
+        if first is not None:
+            first, last = _pop_last(first)
+            if isinstance(last, tuple) and len(last) < _PIECE_LENGTH:
+                piece = last + piece
+            else:
+                first = _join(first, last, None)
+        self.root = _join(first, piece, rest)
+
+    def pop(self, index=-1):
+        """
+        Removes the paragraph at position index in O(log pieces) and returns
+        it.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph to be removed
+
+        Returns
+        -------
+        paragraph : str
+            The removed paragraph
+
+        """
+        if self.root is None:
+            raise IndexError("pop from empty paragraph store")
+        index = self.position(index)
+        paragraph = self[index]
+        first, rest = _split(self.root, index)
+        self.root = _concat(first, _split(rest, 1)[1])
+        return paragraph
+
+    def insert_many(self, index, paragraphs):
+        """
+        Inserts paragraphs before position index, in pieces of at most
+        _PIECE_LENGTH new paragraphs.
+
+        Parameters
+        ----------
+        index : int
+            position of the first new paragraph
+        paragraphs : list
+
+        Returns
+        -------
+        None.
+
+        """
+        if not paragraphs:
+            return
+        length = len(self)
+        if index < 0:
+            index = max(index + length, 0)
+        paragraphs = tuple(paragraphs)
+        pieces = [paragraphs[start:start + _PIECE_LENGTH]
+                  for start in range(0, len(paragraphs), _PIECE_LENGTH)]
+        first, rest = _split(self.root, min(index, length))
+        self.root = _concat(_concat(first, _build(pieces, 0, len(pieces),
+                                                  _piece_node)), rest)
+
+    def delete_range(self, start, stop):
+        """
+        Removes the paragraphs from position start to stop-1. The tree is
+        split before start and at stop and the outer parts are joined again.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph to be removed
+        stop : int
+            position after the last paragraph to be removed
+
+        Returns
+        -------
+        paragraphs : list
+            The removed paragraphs
+
+        """
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        removed = list(self.iter_range(start, stop))
+        first, rest = _split(self.root, start)
+        self.root = _concat(first, _split(rest, stop - start)[1])
+        return removed
+
+    def iter_range(self, start=0, stop=None):
+        """
+        Iterates over the paragraphs from position start to stop-1. The first
+        piece is found in O(log pieces), lines of the file are decoded one
+        after another.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph
+        stop : int
+            position after the last paragraph, None for the end of the text
+
+        Returns
+        -------
+        paragraphs : generator
+
+        """
+        length = len(self)
+        stop = length if stop is None else min(stop, length)
+        count = stop - start
+        stack = []  # nodes that come after start and whose right subtree
+        node = self.root  # has not been visited yet
+        offset = 0  # of start in the piece of the last node on the stack
+        while node and count > 0:
+            size_left = _size(node[_LEFT])
+            if start < size_left:
+                stack.append(node)
+                node = node[_LEFT]
+            elif start >= size_left + len(node[_VALUE]):
+                start -= size_left + len(node[_VALUE])
+                node = node[_RIGHT]
+            else:
+                stack.append(node)
+                offset = start - size_left
+                node = None
+        while count > 0 and stack:
+            node = stack.pop()
+            piece = node[_VALUE][offset:offset + count]
+            offset = 0
+            if isinstance(piece, range):
+                for line_number in piece:
+                    yield self.line(line_number)
+            else:
+                yield from piece
+            count -= len(piece)
+            node = node[_RIGHT]
+            while node:
+                stack.append(node)
+                node = node[_LEFT]
+
+    def snapshot(self):
+        """
+        Returns the current version in O(1). Edits never change a node or a
+        piece, so the old root stays valid, like in TreeParagraphStore.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        snapshot : tuple
+            root of the tree of pieces
+
+        """
+        return self.root
+
+    def restore(self, snapshot):
+        """
+        Goes back to a version returned by snapshot in O(1).
+
+        Parameters
+        ----------
+        snapshot : tuple
+
+        Returns
+        -------
+        None.
+
+        """
+        self.root = snapshot
+
+    def snapshot_size(self, edits=1):
+        # an edit splits the tree at most twice and joins the parts, which
+        # copies a few paths from the root, and copies one piece of new
+        # paragraphs. The lines of the file are shared
+        return edits * (4 * _height(self.root) * _NODE_BYTES
+                        + sys.getsizeof((None,) * _PIECE_LENGTH))
+
+    def is_unchanged(self):
+        """
+        Returns True as long as the text is the content of the file, also
+        after edits that were undone, e.g. to remember only the path of the
+        text instead of its paragraphs (see Workspace).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        unchanged : bool
+
+        """
+        return self.root is self.file_root
+
+    def line(self, line_number):
+        # decodes a line of the file
+        end = self.line_ends[line_number]
+        start = self.line_ends[line_number - 1] + 1 if line_number else 0
+        paragraph = self.base[start:end].decode("utf-8", errors="replace")
+        if paragraph.endswith("\r"):
+            paragraph = paragraph[:-1]
+        return paragraph
+
+    def position(self, index):
+        # turns a list like index into a valid position
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("paragraph index out of range")
+        return index
+
+    def close(self):
+        """
+        Closes the mapped file.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.base is not None:
+            self.base.close()
+        self.file.close()
+
+
+def _lzma_compress(data, level):
+    return lzma.compress(data, preset=level)
+
+
+CODECS = {"zlib": (zlib.compress, zlib.decompress, 1),
+          "lzma": (_lzma_compress, lzma.decompress, 1)}
+# compression for CompressedParagraphStore,
+# name: (compress(data, level), decompress(data), default level).
+# Blocks are compressed again after every edit, so the fast levels are the
+# default; higher levels save 20-30 % more but are 3 to 6 times slower
+
+
+class _Block:
+
+    def __init__(self, paragraphs, data=None):
+        # A block is never changed, an edit creates a new block; snapshots
+        # can therefore share blocks. Only the cached form changes: a cold
+        # block keeps just data, a hot block also (or, until it is first
+        # compressed, only) the tuple of its paragraphs.
+        self.count = len(paragraphs) if paragraphs is not None else 0
+        self.paragraphs = paragraphs
+        self.data = data
+
+
+class CompressedParagraphStore:
+
+    resident = False
+    # the paragraphs are not all kept as strings, so they must not be
+    # referenced elsewhere either (see ParagraphPool)
+
+    def __init__(self, paragraphs=(), block_size=256, hot_blocks=64,
+                 codec="zlib", level=None):
+        # The paragraphs are kept in blocks of about block_size paragraphs.
+        # The hot_blocks blocks that were used last are kept decompressed
+        # in an LRU, all others only compressed with codec (see CODECS).
+        self.block_size = block_size
+        self.hot_blocks = hot_blocks
+        self.codec = codec
+        compress, self.decompress, default_level = CODECS[codec]
+        self.level = default_level if level is None else level
+        self.compress = lambda data: compress(data, self.level)
+        self.hot = OrderedDict()  # LRU of the decompressed blocks
+        self.hits = 0  # accesses to a decompressed block
+        self.misses = 0  # accesses that had to decompress a block
+        self.lock = threading.Lock()
+        # several threads may read the text at the same time (see
+        # EditorServer), the LRU and the counters are changed under the lock
+        paragraphs = list(paragraphs)
+        self.blocks = []
+        for start in range(0, len(paragraphs), block_size):
+            block = _Block(tuple(paragraphs[start:start + block_size]))
+            self.freeze(block)
+            self.blocks.append(block)
+        self.renumber()
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return self.iter_range()
+
+    def __getitem__(self, index):
+        number, offset = self.locate(self.position(index))
+        return self.load(self.blocks[number])[offset]
+
+    def __setitem__(self, index, paragraph):
+        number, offset = self.locate(self.position(index))
+        paragraphs = self.load(self.blocks[number])
+        self.replace_block(number, paragraphs[:offset] + (paragraph,)
+                           + paragraphs[offset + 1:])
+
+    def __repr__(self):
+        return ("CompressedParagraphStore(" + str(self.length) +
+                " paragraphs, " + self.codec + ")")
+
+    def insert(self, index, paragraph):
+        """
+        Inserts a paragraph before position index. Only the block of the
+        position is decompressed and copied.
+
+        Parameters
+        ----------
+        index : int
+            position of the new paragraph
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        if index < 0:
+            index = max(index + self.length, 0)
+        index = min(index, self.length)
+        if not self.blocks:
+            self.blocks.append(_Block(()))
+            self.renumber()
+        if index == self.length:  # append to the last block
+            number = len(self.blocks) - 1
+            offset = self.blocks[number].count
+        else:
+            number, offset = self.locate(index)
+        paragraphs = self.load(self.blocks[number])
+        self.replace_block(number, paragraphs[:offset] + (paragraph,)
+                           + paragraphs[offset:])
+
+    def pop(self, index=-1):
+        """
+        Removes the paragraph at position index and returns it.
+
+        Parameters
+        ----------
+        index : int
+            position of the paragraph to be removed
+
+        Returns
+        -------
+        paragraph : str
+            The removed paragraph
+
+        """
+        number, offset = self.locate(self.position(index))
+        paragraphs = self.load(self.blocks[number])
+        self.replace_block(number, paragraphs[:offset]
+                           + paragraphs[offset + 1:])
+        return paragraphs[offset]
+
+    def insert_many(self, index, paragraphs):
+        """
+        Inserts paragraphs before position index. The block of the position
+        is copied once with all new paragraphs and then split into blocks.
+
+        Parameters
+        ----------
+        index : int
+            position of the first new paragraph
+        paragraphs : list
+
+        Returns
+        -------
+        None.
+
+        """
+        if not paragraphs:
+            return
+        if index < 0:
+            index = max(index + self.length, 0)
+        index = min(index, self.length)
+        if not self.blocks:
+            self.blocks.append(_Block(()))
+            self.renumber()
+        if index == self.length:
+            number = len(self.blocks) - 1
+            offset = self.blocks[number].count
+        else:
+            number, offset = self.locate(index)
+        old_paragraphs = self.load(self.blocks[number])
+        self.replace_block(number, old_paragraphs[:offset] + tuple(paragraphs)
+                           + old_paragraphs[offset:])
+
+    def delete_range(self, start, stop):
+        """
+        Removes the paragraphs from position start to stop-1. The blocks in
+        between are dropped, the rest of the first and the last block become
+        one block.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph to be removed
+        stop : int
+            position after the last paragraph to be removed
+
+        Returns
+        -------
+        paragraphs : list
+            The removed paragraphs
+
+        """
+        stop = min(stop, self.length)
+        if start >= stop:
+            return []
+        removed = list(self.iter_range(start, stop))
+        first, first_offset = self.locate(start)
+        last, last_offset = self.locate(stop - 1)
+        self.replace_block(first, self.load(self.blocks[first])[:first_offset]
+                           + self.load(self.blocks[last])[last_offset + 1:],
+                           last + 1)
+        return removed
+
+    def iter_range(self, start=0, stop=None):
+        """
+        Iterates over the paragraphs from position start to stop-1. Cold
+        blocks are decompressed one at a time but not added to the hot
+        blocks, so reading the whole text does not push them out.
+
+        Parameters
+        ----------
+        start : int
+            position of the first paragraph
+        stop : int
+            position after the last paragraph, None for the end of the text
+
+        Returns
+        -------
+        paragraphs : generator
+
+        """
+        stop = self.length if stop is None else min(stop, self.length)
+        if start >= stop:
+            return
+        number, offset = self.locate(start)
+        count = stop - start
+        while count > 0:
+            paragraphs = self.load(self.blocks[number], keep=False)
+            part = paragraphs[offset:offset + count]
+            yield from part
+            count -= len(part)
+            number += 1
+            offset = 0
+
+    def load(self, block, keep=True):
+        """
+        Returns the paragraphs of a block and counts a hit or a miss.
+
+        Parameters
+        ----------
+        block : _Block
+        keep : bool
+            keep a decompressed block in the hot blocks
+
+        Returns
+        -------
+        paragraphs : tuple
+
+        """
+        with self.lock:
+            paragraphs = block.paragraphs
+            if paragraphs is not None:
+                self.hits += 1
+                if block in self.hot:
+                    self.hot.move_to_end(block)
+                return paragraphs
+            self.misses += 1
+        # decompressed without the lock, so other threads keep reading
+        paragraphs = tuple(self.decompress(block.data).decode(
+            "utf-8").split("\n"))
+        if keep:
+            with self.lock:
+                if block.paragraphs is None:  # not loaded by another thread
+                    block.paragraphs = paragraphs
+                    self.make_hot(block)
+        return paragraphs
+
+    def make_hot(self, block):
+        # adds a block to the LRU and compresses the oldest blocks
+        self.hot[block] = None
+        self.hot.move_to_end(block)
+        while len(self.hot) > self.hot_blocks:
+            cold_block, _ = self.hot.popitem(last=False)
+            self.freeze(cold_block)
+
+    def freeze(self, block):
+        # compresses a block and drops its paragraphs. Paragraphs with a
+        # newline cannot be joined; such a rare block stays decompressed
+        if block.data is None:
+            joined = "\n".join(block.paragraphs)
+            if joined.count("\n") != max(block.count - 1, 0) or \
+                    not block.count:
+                return
+            block.data = self.compress(joined.encode("utf-8"))
+        block.paragraphs = None
+
+    def replace_block(self, number, paragraphs, stop=None):
+        # puts a changed copy of block number (or of the blocks number to
+        # stop-1) into the text
+        stop = number + 1 if stop is None else stop
+        old_blocks = self.blocks[number:stop]
+        for old_block in old_blocks:
+            self.hot.pop(old_block, None)
+            if old_block.paragraphs is not None and \
+                    old_block.data is not None:
+                old_block.paragraphs = None  # the old version is only kept
+                # by snapshots, in its compressed form
+        if len(paragraphs) > 2 * self.block_size:  # split the block
+            parts = len(paragraphs) // self.block_size
+            bounds = [len(paragraphs) * part // parts
+                      for part in range(parts + 1)]
+            new_blocks = [_Block(paragraphs[bounds[part]:bounds[part + 1]])
+                          for part in range(parts)]
+        elif not paragraphs and len(self.blocks) > len(old_blocks):
+            new_blocks = []
+        else:
+            new_blocks = [_Block(paragraphs)]
+        self.blocks[number:stop] = new_blocks
+        for block in new_blocks:
+            self.make_hot(block)
+        if len(new_blocks) == 1 and len(old_blocks) == 1:
+            self.sizes.add(number, new_blocks[0].count - old_blocks[0].count)
+            self.length += new_blocks[0].count - old_blocks[0].count
+        else:
+            self.renumber()
+
+    def renumber(self):
+        # called after blocks were added or removed
+        self.sizes = FenwickTree(block.count for block in self.blocks)
+        self.length = sum(block.count for block in self.blocks)
+
+    def locate(self, index):
+        # returns the block number and the offset inside the block
+        return self.sizes.find(index)
+
+    def position(self, index):
+        # turns a list like index into a valid position
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("paragraph index out of range")
+        return index
+
+    def snapshot(self):
+        """
+        Returns the current version. Blocks are never changed, so only the
+        list of blocks is copied, O(n / block_size).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        snapshot : tuple
+
+        """
+        return tuple(self.blocks)
+
+    def restore(self, snapshot):
+        """
+        Goes back to a version returned by snapshot.
+
+        Parameters
+        ----------
+        snapshot : tuple
+
+        Returns
+        -------
+        None.
+
+        """
+        self.blocks = list(snapshot)
+        self.hot.clear()
+        for block in self.blocks:
+            if block.paragraphs is not None:
+                if block.data is None:  # changed and not yet compressed
+                    self.make_hot(block)
+                else:
+                    block.paragraphs = None
+        self.renumber()
+
+    def snapshot_size(self, edits=1):
+        # the list of blocks and the old version of every changed block
+        return (sys.getsizeof(self.blocks)
+                + edits * sys.getsizeof((None,) * self.block_size))
+
+    def cache_stats(self):
+        """
+        Returns the counters of the hot blocks.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        stats : dict
+            hits, misses, hot_blocks (decompressed now), blocks and
+            compressed_bytes
+
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "hot_blocks": len(self.hot), "blocks": len(self.blocks),
+                "compressed_bytes": sum(len(block.data) for block
+                                        in self.blocks if block.data)}
+
+
+PARAGRAPH_STORES = {"list": ListParagraphStore, "tree": TreeParagraphStore,
+                    "compressed": CompressedParagraphStore}
+# available backends for Editor.text, selectable by name
+
+
+if __name__ == "__main__":
+    import random
+
+    print("\nTest: list and tree store behave the same")
+    list_store = ListParagraphStore()
+    tree_store = TreeParagraphStore()
+    for step in range(2000):
+        position = random.randint(-len(list_store) - 1, len(list_store) + 1)
+        if random.random() < 0.6 or not list_store:
+            list_store.insert(position, str(step))
+            tree_store.insert(position, str(step))
+        else:
+            position = random.randrange(len(list_store))
+            if list_store.pop(position) != tree_store.pop(position):
+                print("Different paragraph removed at step", step)
+    print(list(list_store) == list(tree_store))  # expected output: True
+    print(len(tree_store), _height(tree_store.root))
+
+    print("\nTest: insert_many and delete_range")
+    compressed_store = CompressedParagraphStore(list_store, block_size=16)
+    for store in (list_store, tree_store, compressed_store):
+        store.insert_many(5, [str(number) for number in range(100)])
+        store.insert_many(len(store), ["a", "b"])
+        store.delete_range(3, 50)
+    print(list(list_store) == list(tree_store) == list(compressed_store))
+    # expected output: True
+
+    print("\nTest: snapshot")
+    snapshot = tree_store.snapshot()
+    tree_store.insert(0, "New")
+    tree_store.restore(snapshot)
+    print(list(tree_store) == list(list_store))  # expected output: True
+
+    print("\nTest: compressed store")
+    compressed_store = CompressedParagraphStore(list_store, block_size=8,
+                                                hot_blocks=2)
+    for step in range(500):
+        position = random.randrange(len(list_store))
+        if step % 2:
+            list_store.insert(position, "x" + str(step))
+            compressed_store.insert(position, "x" + str(step))
+        else:
+            list_store[position] = compressed_store[position] = str(step)
+    print(list(compressed_store) == list(list_store))  # expected output: True
+    print(compressed_store.cache_stats()["hot_blocks"])  # expected output: 2
+
+    print("\nTest: get and set")
+    tree_store[0] = "First"
+    print(tree_store[0], tree_store[-1] == list(tree_store)[-1])
+    # expected output: First True
+
+    print("\nTest: mapped store")
+    import os
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "text.txt")
+    with open(path, "w", encoding="utf-8") as text_file:
+        text_file.write("".join(paragraph + "\n" for paragraph in list_store))
+    mapped_store = MappedParagraphStore(path)
+    snapshot = mapped_store.snapshot()
+    for step in range(500):
+        position = random.randrange(len(list_store))
+        if step % 2:
+            list_store.insert(position, "m" + str(step))
+            mapped_store.insert(position, "m" + str(step))
+        else:
+            list_store.pop(position)
+            mapped_store.pop(position)
+    print(list(mapped_store) == list(list_store), _height(mapped_store.root)
+          < 20)
+    # expected output: True True, the pieces are kept balanced
+    mapped_store.restore(snapshot)
+    print(mapped_store.is_unchanged())  # expected output: True
+    mapped_store.close()
+    os.remove(path)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Paragraph Tokens """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import re
+import string
+from array import array
+from itertools import accumulate, compress, count
+from operator import add, sub
+
+
+WORD = re.compile(r"\S+")  # a word is everything between whitespace
+ALPHABET = frozenset(string.ascii_letters)
+
+
+class ParagraphTokens:
+
+    __slots__ = ("positions", "offset", "word_starts", "capitals")
+
+    def __init__(self, paragraph):
+        # The words of a paragraph, found once and shared by everything that
+        # needs them (format fix, index): the prefix sums of the word
+        # lengths with one space after every word (see line_positions), and
+        # a flag for every word that starts with a capital letter. The
+        # flags are only set by the first capital_terms call, format fix
+        # does not need them. If the words are separated by exactly one
+        # space, which is the usual case, word i starts at offset +
+        # positions[i] and nothing else is stored; otherwise the start of
+        # every word is kept in word_starts. The arrays of paragraphs
+        # shorter than 64 KiB take 2 bytes per word.
+        words = paragraph.split()
+        positions = [0]
+        positions += accumulate(map((1).__add__, map(len, words)))
+        size = positions[-1] - 1  # length of the words with one space
+        self.positions = array("H" if len(paragraph) < 0xFFFF else "L",
+                               positions)
+        self.capitals = None
+        self.word_starts = None
+        if len(paragraph) == size and \
+                paragraph.count(" ") + 1 == len(words):
+            self.offset = 0
+            return
+        self.offset = None
+        starts = array(self.positions.typecode,
+                       (match.start() for match in WORD.finditer(paragraph)))
+        if words and starts[-1] + len(words[-1]) - starts[0] == size and \
+                paragraph.count(" ", starts[0], starts[0] + size) + 1 == \
+                len(words):
+            self.offset = starts[0]  # whitespace only before and after
+        else:
+            self.word_starts = starts
+
+    def __len__(self):
+        return len(self.positions) - 1
+
+    @property
+    def single_spaced(self):
+        # True if the words are separated by exactly one space, so that
+        # every line of format fix is a slice of the paragraph
+        return self.offset is not None
+
+    @property
+    def starts(self):
+        # start offsets of the words
+        if self.word_starts is not None:
+            return self.word_starts
+        if not self.offset:
+            return self.positions[:-1]
+        return array(self.positions.typecode,
+                     map(self.offset.__add__, self.positions[:-1]))
+
+    @property
+    def lengths(self):
+        # lengths of the words
+        positions = self.positions
+        return array(positions.typecode, map(
+            (-1).__add__, map(sub, positions[1:], positions)))
+
+    def ends(self):
+        """
+        Returns the end offsets of the words.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        ends : array
+
+        """
+        return array(self.positions.typecode, map(add, self.starts,
+                                                  self.lengths))
+
+    def line_positions(self):
+        """
+        Returns the prefix sums of the word lengths with one space after
+        every word: the words i to j-1 form a line of positions[j] -
+        positions[i] - 1 characters. They do not depend on the column width,
+        so the line breaks for any width are found by binary search (see
+        WordWrap.wrap_paragraph).
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        positions : array
+            one element more than there are words
+
+        """
+        return self.positions
+
+    def capital_terms(self, paragraph):
+        """
+        Returns the terms of the paragraph that start with a capital letter,
+        in the order of their first occurrence. A symbol/punctuation at the
+        end of a term is cut off.
+
+        Parameters
+        ----------
+        paragraph : str
+            the paragraph of the tokens
+
+        Returns
+        -------
+        terms : tuple
+            Every term only once
+
+        """
+        starts = self.starts
+        if self.capitals is None:
+            self.capitals = bytes(map(str.isupper, map(paragraph.__getitem__,
+                                                       starts)))
+        terms = {}
+        positions = self.positions
+        for word in compress(count(), self.capitals):
+            start = starts[word]
+            term = paragraph[start:start + positions[word + 1]
+                             - positions[word] - 1]
+            if term[-1] not in ALPHABET:
+                # cuts last character if it is a symbol/punctuation
+                term = term[:-1]
+            terms[term] = None
+        return tuple(terms)
+
+
+if __name__ == "__main__":
+    print("\nTest: ParagraphTokens")
+    tokens = ParagraphTokens("Hund  und Katze, Hund.")
+    print(list(tokens.starts), list(tokens.lengths))
+    # expected output: [0, 6, 10, 17] [4, 3, 6, 5]
+    print(tokens.capital_terms("Hund  und Katze, Hund."))
+    # expected output: ('Hund', 'Katze')
+    print(list(tokens.line_positions()))  # expected output: [0, 5, 9, 16, 22]
+    print(tokens.single_spaced, ParagraphTokens(" Hund und ").single_spaced)
+    # expected output: False True
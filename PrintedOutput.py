@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Printed Output """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+from array import array
+from difflib import SequenceMatcher
+
+
+def fingerprint(lines):
+    """
+    Returns the fingerprint of the output lines of a paragraph: the hash of
+    every line, 8 bytes per line instead of the line itself.
+
+    Parameters
+    ----------
+    lines : iterable
+
+    Returns
+    -------
+    fingerprint : bytes
+
+    """
+    return array("q", map(hash, lines)).tobytes()
+
+
+def line_hashes(fingerprints):
+    """
+    Returns the line hashes of several paragraphs as one sequence.
+
+    Parameters
+    ----------
+    fingerprints : iterable
+        fingerprints of the paragraphs (see fingerprint)
+
+    Returns
+    -------
+    hashes : array
+
+    """
+    return array("q", b"".join(fingerprints))
+
+
+class PrintedOutput:
+
+    def __init__(self, output_format, fingerprints):
+        # The output of the last PRINT CHANGES, as the fingerprint of every
+        # paragraph (see fingerprint), and the edits since then. The edits
+        # are kept as runs of the current text: [first printed paragraph,
+        # number of paragraphs] for paragraphs that were not edited since,
+        # [None, number of paragraphs] for new or changed ones. Consecutive
+        # edits in the same place share a run.
+        self.format = output_format  # current_format of the editor
+        self.fingerprints = fingerprints  # list with bytes per paragraph
+        self.runs = [[0, len(fingerprints)]]
+        self.run_limit = 4096
+        # with more runs the edits are forgotten (see forget) and the whole
+        # text is compared on the next print
+
+    def inserted(self, index):
+        """
+        Records a paragraph that was inserted before position index.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.runs is None:
+            return
+        number = self.split(index)
+        runs = self.runs
+        if number < len(runs) and runs[number][0] is None:
+            runs[number][1] += 1
+        elif number > 0 and runs[number - 1][0] is None:
+            runs[number - 1][1] += 1
+        else:
+            runs.insert(number, [None, 1])
+            if len(runs) > self.run_limit:
+                self.forget()
+
+    def removed(self, index):
+        """
+        Records a paragraph that was removed at position index. A printed
+        paragraph is left out of its run, so it shows up as removed.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        None.
+
+        """
+        if self.runs is None:
+            return
+        number = self.split(index)
+        run = self.runs[number]
+        if run[0] is not None:
+            run[0] += 1
+        run[1] -= 1
+        if not run[1]:
+            del self.runs[number]
+
+    def changed(self, index):
+        """
+        Records a paragraph that was replaced in place at position index.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        None.
+
+        """
+        self.removed(index)
+        self.inserted(index)
+
+    def forget(self):
+        """
+        Forgets the edits, e.g. after UNDO, which replaces the text with a
+        snapshot. The next print compares the whole text.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.runs = None
+
+    def split(self, index):
+        # returns the number of the run that starts at position index, the
+        # run that contains index is split if necessary
+        position = 0
+        for number, (start, length) in enumerate(self.runs):
+            if index < position + length:
+                offset = index - position
+                if not offset:
+                    return number
+                self.runs[number:number + 1] = [
+                    [start, offset],
+                    [None if start is None else start + offset,
+                     length - offset]]
+                return number + 1
+            position += length
+        return len(self.runs)
+
+    def changed_ranges(self, fingerprints=None):
+        """
+        Returns the parts of the text that differ from the printed output,
+        from the runs or, if the edits were forgotten, by comparing the
+        fingerprints of the whole text.
+
+        Parameters
+        ----------
+        fingerprints : list
+            fingerprints of the current text, needed if the edits were
+            forgotten
+
+        Returns
+        -------
+        ranges : list
+            tuples (printed first, printed stop, first, stop): the printed
+            paragraphs printed_first to printed_stop-1 were replaced by the
+            paragraphs first to stop-1 of the text (0-based)
+
+        """
+        if self.runs is None:
+            matcher = SequenceMatcher(None, self.fingerprints, fingerprints)
+            return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2
+                    in matcher.get_opcodes() if tag != "equal"]
+        ranges = []
+        printed = position = first = 0
+        # next printed paragraph, next position in the text and first
+        # position after the last run that was not edited
+        for start, length in self.runs + [[len(self.fingerprints), 0]]:
+            if start is None:
+                position += length
+                continue
+            if start > printed or position > first:
+                ranges.append((printed, start, first, position))
+            printed = start + length
+            position += length
+            first = position
+        return ranges
+
+
+if __name__ == "__main__":
+    print("\nTest: PrintedOutput")
+    printed = PrintedOutput(("raw", 0), [fingerprint([str(number)])
+                                         for number in range(6)])
+    printed.changed(1)
+    printed.inserted(2)
+    printed.removed(5)
+    print(printed.changed_ranges())
+    # expected output: [(1, 2, 1, 3), (4, 5, 5, 5)]
+    printed.forget()
+    print(printed.changed_ranges(printed.fingerprints[:3]))
+    # expected output: [(3, 6, 3, 3)]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Term Index """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import sys
+
+from ParagraphTokens import ParagraphTokens
+
+
+def capital_terms(paragraph):
+    """
+    Returns the terms of a paragraph that start with a capital letter, in the
+    order of their first occurrence. A symbol/punctuation at the end of a
+    term is cut off.
+
+    Parameters
+    ----------
+    paragraph : str
+
+    Returns
+    -------
+    terms : tuple
+        Every term only once
+
+    """
+    return ParagraphTokens(paragraph).capital_terms(paragraph)
+
+
+class TermIndex:
+
+    def __init__(self, terms_of=capital_terms):
+        self.terms_of = terms_of
+        # returns the terms of a paragraph, e.g. from the tokens the editor
+        # keeps for every paragraph (see Editor.tokens)
+        self.postings = {}
+        # key: term, value: set with the ids of the paragraphs containing it
+        self.paragraph_terms = {}
+        # key: paragraph id, value: terms of the paragraph (see capital_terms)
+
+    def add(self, paragraph_id, paragraph):
+        """
+        Adds the terms of a new paragraph to the index.
+
+        Parameters
+        ----------
+        paragraph_id : int
+            id of the paragraph (see ParagraphIds)
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        terms = tuple(map(sys.intern, self.terms_of(paragraph)))
+        # all paragraphs share one string per term
+        self.paragraph_terms[paragraph_id] = terms
+        for term in terms:
+            if term not in self.postings:
+                self.postings[term] = {paragraph_id}
+            else:
+                self.postings[term].add(paragraph_id)
+
+    def remove(self, paragraph_id):
+        """
+        Removes the terms of a deleted paragraph from the index.
+
+        Parameters
+        ----------
+        paragraph_id : int
+            id of the paragraph (see ParagraphIds)
+
+        Returns
+        -------
+        None.
+
+        """
+        for term in self.paragraph_terms.pop(paragraph_id):
+            paragraph_ids = self.postings[term]
+            paragraph_ids.discard(paragraph_id)
+            if not paragraph_ids:
+                del self.postings[term]
+
+    def posting_count(self):
+        """
+        Returns the number of (term, paragraph) pairs in the index.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        count : int
+
+        """
+        return sum(map(len, self.postings.values()))
+
+    def word_index(self, position_of):
+        """
+        Builds the word index from the postings. The paragraph numbers of a
+        term are sorted, and the terms are ordered by their first occurrence
+        in the text.
+
+        Parameters
+        ----------
+        position_of : function
+            returns the current 0-based position of a paragraph id
+
+        Returns
+        -------
+        word_index : dict
+            key: term, value: list with the paragraph numbers
+
+        """
+        first_occurrence = {}
+        word_index = {}
+        for term, paragraph_ids in self.postings.items():
+            numbers = sorted((position_of(paragraph_id) + 1, paragraph_id)
+                             for paragraph_id in paragraph_ids)
+            number, paragraph_id = numbers[0]
+            first_occurrence[term] = (
+                number, self.paragraph_terms[paragraph_id].index(term))
+            word_index[term] = [number for number, _ in numbers]
+        return {term: word_index[term]
+                for term in sorted(word_index, key=first_occurrence.get)}
+
+
+if __name__ == "__main__":
+    print("\nTest: capital_terms")
+    print(capital_terms("Hund und Katze, Hund."))  # expected: ('Hund', 'Katze')
+
+    print("\nTest: TermIndex")
+    term_index = TermIndex()
+    term_index.add(7, "Katze Hund")
+    term_index.add(3, "Hund")
+    term_index.remove(7)
+    term_index.add(7, "Maus")
+    print(term_index.word_index({3: 0, 7: 1}.get))
+    # expected output: {'Hund': [1], 'Maus': [2]}
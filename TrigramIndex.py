@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Trigram Index """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+from array import array
+
+
+def trigrams(text):
+    """
+    Returns the distinct substrings of length 3 of a text, as tuples of
+    three characters (cheaper to create than slices).
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    trigrams : set
+
+    """
+    return set(zip(text, text[1:], text[2:]))
+
+
+class TrigramIndex:
+
+    def __init__(self, paragraph_of=None):
+        self.postings = {}
+        # key: trigram, value: array with the ids of the paragraphs that
+        # contain it (see ParagraphIds). Removing a paragraph does not touch
+        # the postings, its id just stays behind; every candidate is checked
+        # against its paragraph anyway.
+        self.paragraph_of = paragraph_of
+        # returns the paragraph of an id from the text, e.g. for a store
+        # that does not keep its paragraphs as strings. None keeps the
+        # paragraphs in the index
+        self.paragraphs = {}
+        # key: id of every paragraph in the index, value: paragraph (None if
+        # paragraph_of is given), to check candidates without looking up
+        # their position in the text
+        self.stale_count = 0  # removed paragraphs that are still in postings
+
+    def add(self, paragraph_id, paragraph):
+        """
+        Adds the trigrams of a new paragraph to the index.
+
+        Parameters
+        ----------
+        paragraph_id : int
+            id of the paragraph (see ParagraphIds)
+        paragraph : str
+
+        Returns
+        -------
+        None.
+
+        """
+        postings = self.postings
+        for trigram in trigrams(paragraph):
+            posting = postings.get(trigram)
+            if posting is None:
+                postings[trigram] = array("I", (paragraph_id,))
+            else:
+                posting.append(paragraph_id)
+        self.paragraphs[paragraph_id] = (paragraph if self.paragraph_of is None
+                                         else None)
+
+    def remove(self, paragraph_id):
+        """
+        Marks the entries of a removed paragraph as outdated. An id that is
+        added again later may show up twice in a posting.
+
+        Parameters
+        ----------
+        paragraph_id : int
+            id of the paragraph (see ParagraphIds)
+
+        Returns
+        -------
+        None.
+
+        """
+        del self.paragraphs[paragraph_id]
+        self.stale_count += 1
+
+    def paragraph(self, paragraph_id):
+        """
+        Returns the paragraph of an id in the index.
+
+        Parameters
+        ----------
+        paragraph_id : int
+
+        Returns
+        -------
+        paragraph : str
+
+        """
+        if self.paragraph_of is None:
+            return self.paragraphs[paragraph_id]
+        return self.paragraph_of(paragraph_id)
+
+    def is_outdated(self):
+        """
+        Returns True when most entries belong to removed paragraphs, so that
+        building the index again is cheaper than searching it.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        outdated : bool
+
+        """
+        return self.stale_count > max(len(self.paragraphs), 1024)
+
+    def find(self, query, limit):
+        """
+        Returns the ids of the paragraphs that contain the query. Candidates
+        must contain every trigram of the query: the shortest postings are
+        intersected first, and the intersection stops once a posting is
+        much longer than the current candidates, because checking a
+        candidate is cheaper then.
+
+        Parameters
+        ----------
+        query : str
+            at least three characters
+        limit : int
+            None is returned if there would be more candidates than limit
+
+        Returns
+        -------
+        paragraph_ids : list
+            None if there are more than limit candidates
+
+        """
+        postings = []
+        for trigram in trigrams(query):
+            posting = self.postings.get(trigram)
+            if posting is None:  # no paragraph contains the trigram
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        if len(postings[0]) > limit:
+            return None
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates or len(posting) > 4 * len(candidates):
+                break
+            candidates.intersection_update(posting)
+        paragraphs = self.paragraphs
+        paragraph = self.paragraph
+        return [paragraph_id for paragraph_id in candidates
+                if paragraph_id in paragraphs
+                and query in paragraph(paragraph_id)]
+
+
+if __name__ == "__main__":
+    print("\nTest: trigrams")
+    print(sorted(trigrams("Hunde")))
+    # expected output: [('H', 'u', 'n'), ('n', 'd', 'e'), ('u', 'n', 'd')]
+
+    print("\nTest: TrigramIndex")
+    trigram_index = TrigramIndex()
+    trigram_index.add(0, "Hund und Katze")
+    trigram_index.add(1, "Katze")
+    trigram_index.add(2, "Hundekatze")
+    trigram_index.remove(1)
+    print(sorted(trigram_index.find("Katz", 10)))  # expected output: [0]
+    print(trigram_index.find("Maus", 10))  # expected output: []
+
+    print("\nTest: TrigramIndex without paragraphs")
+    text = {0: "Hund und Katze", 1: "Katze"}
+    trigram_index = TrigramIndex(text.get)
+    for paragraph_id, paragraph in text.items():
+        trigram_index.add(paragraph_id, paragraph)
+    print(sorted(trigram_index.find("Katz", 10)), trigram_index.paragraphs)
+    # expected output: [0, 1] {0: None, 1: None}
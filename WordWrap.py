@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Word Wrap """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+from bisect import bisect_right
+
+from ParagraphTokens import ParagraphTokens
+
+
+def wrap_paragraph(paragraph, b, tokens=None):
+    """
+    Wraps a paragraph to a maximum column width of b characters. The rules
+    are the ones of Editor.format_fix:
+        - Words are separated by a single space, wrapping is only allowed
+        after a space. The space stays at the end of the line.
+        - A word is moved to the next line as soon as the line without the
+        trailing space would get longer than b.
+        - A word longer than b is split after b characters.
+        - The last line of a paragraph ends with a newline, an empty
+        paragraph is a single newline.
+    The end of every line is found by binary search in the word positions
+    (see ParagraphTokens.line_positions), which do not depend on b, so with
+    cached tokens wrapping for another width costs one search and one slice
+    per line. Paragraphs whose words are not separated by single spaces, or
+    with a word longer than b, take the general way (see _wrap_words).
+
+    Parameters
+    ----------
+    paragraph : str
+    b : int
+        maximum column width
+    tokens : ParagraphTokens
+        words of the paragraph, found here if not given
+
+    Returns
+    -------
+    lines : tuple
+        The lines of the paragraph
+
+    """
+    if tokens is None:
+        tokens = ParagraphTokens(paragraph)
+    offset = tokens.offset
+    if offset is not None and len(tokens):  # every line is a slice
+        positions = tokens.positions
+        end = positions[-1] - 1  # end of the last word
+        if end <= b:  # fits on one line
+            if offset == 0 and end == len(paragraph):
+                return (paragraph + "\n",)
+            return (paragraph[offset:offset + end] + "\n",)
+        lines = []
+        word = 0  # first word of the line
+        start = 0  # its position
+        while start + b < end:  # the rest does not fit on the line
+            # the line ends before the first word whose position is past
+            # the limit
+            next_word = bisect_right(positions, start + b + 1, word + 1) - 1
+            if next_word == word:  # word longer than b
+                break
+            stop = positions[next_word]
+            lines.append(paragraph[offset + start:offset + stop])
+            word, start = next_word, stop
+        else:
+            lines.append(paragraph[offset + start:offset + end] + "\n")
+            return tuple(lines)
+    return tuple(_wrap_words(paragraph, b, tokens))
+
+
+def _wrap_words(paragraph, b, tokens):
+    # wraps a paragraph word by word, also words longer than b, and yields
+    # the lines (see wrap_paragraph)
+    starts = tokens.starts
+    lengths = tokens.lengths
+    positions = tokens.line_positions()
+    count = len(starts)
+    if count == 0:
+        yield "\n"
+        return
+
+    single_spaced = tokens.single_spaced
+
+    def join(first, last):
+        # words first to last-1 separated by single spaces
+        if single_spaced:
+            return paragraph[starts[first]:
+                             starts[last - 1] + lengths[last - 1]]
+        return " ".join([paragraph[starts[word]:starts[word] + lengths[word]]
+                         for word in range(first, last)])
+
+    head = -1      # word at the start of the column, -1 for none
+    rest = None    # rest of a split word at the start of the column
+    new_length = 0  # length of the word that was added last
+    line = None    # last line that was built, it is yielded delayed
+    word = 0  # next word to add
+    while word < count:
+        column_head, column_rest = head, rest
+        if rest is not None:
+            column_length = len(rest)
+        elif head >= 0:
+            column_length = lengths[head]
+        else:
+            column_length = 0
+        first = word
+        if column_length <= b and word < count:
+            # adds words as long as the column is not longer than b: the
+            # first word that makes it longer is the first one whose
+            # position is past the limit
+            limit = positions[first] + b - column_length
+            if not column_length:  # no space before the first word
+                limit += 1
+            word = bisect_right(positions, limit, first + 1, count)
+            new_length = lengths[word - 1]
+
+        if line is not None:
+            yield line
+        if word > first:
+            last_word = word - 1
+            if new_length > b:  # word longer than b
+                rest = paragraph[starts[last_word]:
+                                 starts[last_word] + lengths[last_word]]
+            else:  # the line ends before the word that was added last
+                if rest is not None:
+                    line = rest + " "
+                    if last_word > first:
+                        line += join(first, last_word) + " "
+                elif head >= 0:
+                    line = join(head, last_word) + " "
+                elif last_word > 0:
+                    line = join(0, last_word) + " "
+                else:
+                    line = ""
+                head = last_word
+                rest = None
+                continue
+        line = rest[:b]
+        rest = rest[b:]
+        new_length = len(rest)
+        head = -1
+
+    # handling last word in paragraph
+    if len(line) + new_length > b:
+        yield line
+        if rest is not None:
+            yield rest + "\n"
+        else:
+            yield paragraph[starts[-1]:starts[-1] + lengths[-1]] + "\n"
+    elif column_rest is not None:
+        yield column_rest + " " + join(first, count) + "\n"
+    elif column_head >= 0:
+        yield join(column_head, count) + "\n"
+    else:
+        yield join(0, count) + "\n"
+
+
+def wrap_many(paragraphs, b):
+    """
+    Wraps a list of paragraphs. Used by the worker processes of the parallel
+    format fix (see Editor.set_parallel).
+
+    Parameters
+    ----------
+    paragraphs : list
+    b : int
+        maximum column width
+
+    Returns
+    -------
+    lines : list
+        tuple with the lines for every paragraph
+
+    """
+    return [wrap_paragraph(paragraph, b) for paragraph in paragraphs]
+
+
+if __name__ == "__main__":
+    print("\nTest: wrap_paragraph")
+    print(list(wrap_paragraph("Lorem ipsum dolor sit amet", 11)))
+    # expected output: ['Lorem ipsum ', 'dolor sit ', 'amet\n']
+    print(list(wrap_paragraph("Donaudampfschifffahrt", 5)))
+    # expected output: ['Donau', 'dampfschifffahrt\n']
+    print(list(wrap_paragraph("", 5)))  # expected output: ['\n']
+
+    print("\nTest: wrap_paragraph, the general way")
+    print(wrap_paragraph("Lorem  ipsum dolor sit amet", 11))
+    # expected output: ('Lorem ipsum ', 'dolor sit ', 'amet\n')
+    print(wrap_paragraph("Donaudampfschifffahrt x", 5))
+    # expected output: ('Donau', 'dampf', 'schif', 'ffahr', 't x\n')
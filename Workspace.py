@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Workspace """
+
+__author__     = 'Lars Schneckenburger'
+__copyright__  = 'Copyright 2022 Storm Hamsters'
+__credits__    = 'Anja Edelmann, Ricky Raths, Lars Schneckenburger, Salah Xaaji'
+__license__    = 'GPL'
+__version__    = '1.0'
+__created__    = '18.10.2026'
+__maintainer__ = 'Lars Schneckenburger'
+__email__      = 'schnela@students.zhaw.ch'
+__status__     = 'done'
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+
+from Editor import Editor
+from ParagraphStore import MappedParagraphStore
+
+
+UNTITLED = "untitled"
+# name of the document a workspace starts with
+
+
+class Document:
+
+    def __init__(self, name, editor):
+        self.name = name
+        self.editor = editor  # None while the document is on disk
+        self.swap_path = None  # file of the document while it is on disk
+        self.source_path = None
+        self.source_format = None
+        # instead of swap_path: the loaded file and the format of a text
+        # without changes (see Editor.load) while it is on disk
+        self.journal = None  # journal of the editor while it is on disk
+        self.memory = 0
+        # memory of the editor when it was last used (see
+        # Editor.memory_usage), the text does not change meanwhile
+
+
+class Workspace:
+
+    def __init__(self, editor_factory=Editor, memory_limit=None):
+        # Documents that were not used recently are written to a compressed
+        # file and their editor is dropped when the documents together use
+        # more than memory_limit bytes. They are read again on the next
+        # SWITCH, but without their UNDO/REDO history.
+        self.editor_factory = editor_factory
+        # creates the editor of a new document, e.g. with the settings of
+        # the command line
+        self.memory_limit = memory_limit  # bytes, None for no limit
+        self.documents = OrderedDict()
+        # key: name, value: Document, the least recently used first
+        self.current = None
+        self.swap_directory = None  # created on the first eviction
+        self.swap_count = 0
+        self.switch(UNTITLED)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def switch(self, name):
+        """
+        Makes a document the current document. A new, empty document is
+        created if there is none with the name, a document on disk is read
+        again.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        document : Document
+
+        """
+        document = self.documents.get(name)
+        if document is None:
+            document = Document(name, self.editor_factory())
+            self.documents[name] = document
+        return self.use(document)
+
+    def open(self, path):
+        """
+        Opens a text that was saved with SAVE as a new document, named by
+        its path. A document that is already open is only switched to.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        document : Document
+
+        """
+        if path in self.documents:
+            return self.switch(path)
+        editor = self.editor_factory()
+        try:
+            editor.open(path)
+        except (OSError, ValueError):
+            editor.close()
+            raise
+        document = Document(path, editor)
+        self.documents[path] = document
+        return self.use(document)
+
+    def close(self, name=None):
+        """
+        Closes a document, the changes since the last SAVE are lost. The
+        most recently used document becomes the current one; after the last
+        document a new, empty document is created.
+
+        Parameters
+        ----------
+        name : str
+            default is the current document
+
+        Returns
+        -------
+        document : Document
+            the new current document
+
+        Raises
+        ------
+        KeyError
+            if there is no document with the name
+
+        """
+        document = self.documents.pop(self.current.name if name is None
+                                      else name)
+        if document.editor is not None:
+            document.editor.close()
+        if document.swap_path is not None:
+            os.remove(document.swap_path)
+        if document is not self.current:
+            return self.current
+        self.current = None
+        if not self.documents:
+            return self.switch(UNTITLED)
+        return self.use(next(reversed(self.documents.values())))
+
+    def close_all(self):
+        """
+        Closes all editors and removes the files of the documents on disk.
+
+        Parameters
+        ----------
+        None.
+
+        Returns
+        -------
+        None.
+
+        """
+        for document in self.documents.values():
+            if document.editor is not None:
+                document.editor.close()
+        self.documents.clear()
+        self.current = None
+        if self.swap_directory is not None:
+            shutil.rmtree(self.swap_directory, ignore_errors=True)
+            self.swap_directory = None
+
+    def use(self, document):
+        # makes document the current, most recently used document and moves
+        # documents to disk until the memory limit is kept
+        if self.current is not None and self.current is not document:
+            self.current.memory = self.current.editor.memory_usage()
+        self.documents.move_to_end(document.name)
+        if document.editor is None:
+            self.reload(document)
+        self.current = document
+        if self.memory_limit is not None:
+            memory = document.editor.memory_usage()
+            resident = [other for other in self.documents.values()
+                        if other.editor is not None and other is not document]
+            memory += sum(other.memory for other in resident)
+            for other in resident:  # least recently used first
+                if memory <= self.memory_limit:
+                    break
+                memory -= other.memory
+                self.evict(other)
+        return document
+
+    def evict(self, document):
+        """
+        Writes a document to a compressed file and drops its editor: a line
+        with the format, then every paragraph as a JSON string. A loaded
+        text without changes is not written, only the path of its file is
+        kept. The editor is closed, which also closes a loaded file.
+
+        Parameters
+        ----------
+        document : Document
+
+        Returns
+        -------
+        None.
+
+        """
+        editor = document.editor
+        document.journal = editor.journal
+        editor.set_journal(None)
+        if isinstance(editor.text, MappedParagraphStore) and \
+                editor.text.is_unchanged():
+            document.source_path = editor.text.path
+            document.source_format = editor.current_format
+            editor.close()
+            document.editor = None
+            return
+        if self.swap_directory is None:
+            self.swap_directory = tempfile.mkdtemp(prefix="editor-")
+        self.swap_count += 1
+        path = os.path.join(self.swap_directory,
+                            str(self.swap_count) + ".json.gz")
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=1) as file:
+            file.write(json.dumps(list(editor.current_format)) + "\n")
+            block = []
+            for paragraph in editor.text:
+                block.append(json.dumps(paragraph, ensure_ascii=False))
+                if len(block) >= 4096:
+                    file.write("\n".join(block) + "\n")
+                    block = []
+            if block:
+                file.write("\n".join(block) + "\n")
+        editor.close()
+        document.editor = None
+        document.swap_path = path
+
+    def reload(self, document):
+        """
+        Reads a document from its file, the file is removed. A loaded text
+        is loaded again from its path.
+
+        Parameters
+        ----------
+        document : Document
+
+        Returns
+        -------
+        None.
+
+        """
+        editor = self.editor_factory()
+        if document.source_path is not None:
+            editor.load(document.source_path)
+            current_format = document.source_format
+        else:
+            with gzip.open(document.swap_path, "rt",
+                           encoding="utf-8") as file:
+                current_format = json.loads(file.readline())
+                editor.set_text(json.loads(line) for line in file)
+            os.remove(document.swap_path)
+        editor.change_format(*current_format)
+        editor.set_journal(document.journal)  # later SAVEs append to it
+        document.editor = editor
+        document.swap_path = None
+        document.source_path = None
+        document.source_format = None
+        document.journal = None
+
+
+if __name__ == "__main__":
+    print("\nTest: switch")
+    workspace = Workspace()
+    workspace.current.editor.add_n("Hund", 1)
+    workspace.switch("zweites")
+    workspace.current.editor.add_n("Katze", 1)
+    print(list(workspace.documents))
+    # expected output: ['untitled', 'zweites']
+
+    print("\nTest: evict and reload")
+    workspace.memory_limit = 0  # only the current document stays in memory
+    workspace.current.editor.change_format("fix", 20)
+    workspace.switch(UNTITLED)
+    print(workspace.documents["zweites"].editor)  # expected output: None
+    document = workspace.switch("zweites")
+    print(list(document.editor.text), document.editor.current_format)
+    # expected output: ['Katze'] ('fix', 20)
+
+    print("\nTest: evict a loaded text")
+    text_path = os.path.join(tempfile.mkdtemp(), "text.txt")
+    with open(text_path, "w", encoding="utf-8") as text_file:
+        text_file.write("Maus\nElefant\n")
+    loaded = workspace.switch(text_path)
+    loaded.editor.load(text_path)
+    store = loaded.editor.text
+    workspace.switch("zweites")
+    print(loaded.source_path == text_path, loaded.swap_path, store.file.closed)
+    # expected output: True None True, only the path is kept
+    workspace.switch(text_path)
+    print(list(loaded.editor.text), loaded.source_path)
+    # expected output: ['Maus', 'Elefant'] None
+    loaded.editor.add_n("Igel", 1)
+    workspace.switch("zweites")
+    print(loaded.source_path, loaded.swap_path is not None)
+    # expected output: None True, a changed text is written
+    workspace.close(text_path)
+    os.remove(text_path)
+
+    print("\nTest: close")
+    print(workspace.close().name)  # expected output: untitled
+    print(workspace.close().name, len(workspace))
+    # expected output: untitled 1
+    workspace.close_all()
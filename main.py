@@ -14,8 +14,110 @@ __email__      = 'schnela@students.zhaw.ch'
 __status__     = 'done'
 
 
+import argparse
+import asyncio
+import sys
+from contextlib import nullcontext
+from functools import partial
+
+from Editor import Editor
+from EditorServer import EditorServer, send_script
 from EditorUI import EditorUI
+from ParagraphStore import CODECS, PARAGRAPH_STORES, CompressedParagraphStore
+from Workspace import Workspace
+
+
+parser = argparse.ArgumentParser(description="Text editor")
+parser.add_argument("-b", "--batch", metavar="SCRIPT",
+                    help="run the commands of a script file without menu "
+                         "and prompts, '-' reads the script from stdin")
+parser.add_argument("-w", "--workers", type=int, default=0,
+                    help="number of processes for format fix on large texts")
+parser.add_argument("--parallel-threshold", type=int, default=100000,
+                    help="minimum number of paragraphs for the parallel "
+                         "format fix")
+parser.add_argument("--history-memory", type=int, default=64, metavar="MB",
+                    help="memory for the UNDO/REDO history in megabytes")
+parser.add_argument("--workspace-memory", type=int, default=1024,
+                    metavar="MB",
+                    help="memory of all open documents in megabytes, the "
+                         "least recently used are moved to disk")
+parser.add_argument("--store", choices=sorted(PARAGRAPH_STORES),
+                    default="tree",
+                    help="how the paragraphs are stored, default: tree")
+parser.add_argument("--compress", choices=sorted(CODECS),
+                    help="keep paragraphs that were not used recently "
+                         "compressed with a codec, implies --store "
+                         "compressed")
+parser.add_argument("--block-size", type=int, default=256,
+                    help="paragraphs per compressed block")
+parser.add_argument("--hot-blocks", type=int, default=64,
+                    help="number of blocks that are kept decompressed")
+parser.add_argument("--level", type=int,
+                    help="compression level, default: 1 (fast)")
+parser.add_argument("--background", action="store_true",
+                    help="format and index the text in a background thread "
+                         "while waiting for the next command (not in batch "
+                         "mode)")
+parser.add_argument("--stats", action="store_true",
+                    help="record the time of every command for STATS")
+parser.add_argument("--serve", metavar="ADDRESS",
+                    help="run as server for many clients on HOST:PORT or a "
+                         "Unix socket path")
+parser.add_argument("--connect", metavar="ADDRESS",
+                    help="send the script of --batch (default: stdin) to a "
+                         "running server")
+arguments = parser.parse_args()
+# EDITOR_PROFILE=<file> profiles the session with cProfile (see EditorUI)
+
+
+def configure(editor):
+    # applies the settings of the command line to an editor
+    editor.set_parallel(arguments.workers, arguments.parallel_threshold)
+    editor.set_history_limit(arguments.history_memory * 2**20)
+    if arguments.compress or arguments.store == "compressed":
+        editor.set_store_factory(partial(
+            CompressedParagraphStore, block_size=arguments.block_size,
+            hot_blocks=arguments.hot_blocks,
+            codec=arguments.compress or "zlib", level=arguments.level))
+    elif arguments.store != "tree":
+        editor.set_store_factory(PARAGRAPH_STORES[arguments.store])
+    return editor
+
+
+def open_script(path):
+    # the script file for a with statement, which closes only a file that
+    # was opened here and never sys.stdin
+    if path is None or path == "-":
+        return nullcontext(sys.stdin)
+    return open(path, encoding="utf-8")
+
 
+if arguments.serve:
+    server = EditorServer(lambda: configure(Editor()))
+    try:
+        asyncio.run(server.serve(arguments.serve))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    sys.exit()
+if arguments.connect:
+    with open_script(arguments.batch) as script:
+        asyncio.run(send_script(arguments.connect, script, sys.stdout))
+    sys.exit()
 
-text_editor = EditorUI()
-text_editor.run()
+workspace = Workspace(lambda: configure(Editor()),
+                      arguments.workspace_memory * 2**20)
+text_editor = EditorUI(arguments.stats, workspace=workspace,
+                       background=(arguments.background
+                                   and arguments.batch is None))
+if arguments.batch is None:
+    text_editor.run()
+else:
+    output = open(sys.stdout.fileno(), "w", buffering=1 << 20,
+                  encoding=sys.stdout.encoding, closefd=False)
+    # large buffer, the output is written in big blocks instead of per line
+    with open_script(arguments.batch) as script, output:
+        text_editor.run_batch(script, output)
+workspace.close_all()